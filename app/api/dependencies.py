@@ -1,12 +1,13 @@
 """
-FastAPI dependencies for tenant-scoped services.
+FastAPI dependencies for control database and tenant-scoped services.
 
-These dependencies resolve tenant databases and create tenant-scoped service instances
-per request.
+These dependencies resolve tenant databases and create tenant-scoped service instances.
+Service bundles are cached per tenant and dropped when the tenant's pool is evicted.
 """
 
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import functools
+from typing import Dict, NamedTuple, Optional
+from fastapi import HTTPException, status
 
 from app.db.database import Database
 from app.db.tenant_db_manager import TenantDatabaseManager
@@ -19,19 +20,96 @@ from app.service import (
     NodeService,
     NodeTypeService,
     RelationshipService,
+    TenantService,
+    UserService,
 )
 
 
+class TenantServices(NamedTuple):
+    """Tenant-scoped service instances bound to one tenant database."""
+    node_type: NodeTypeService
+    node: NodeService
+    relationship: RelationshipService
+
+
 # Global tenant database manager (set by main.py)
 _tenant_db_manager: Optional[TenantDatabaseManager] = None
 
+# Control database services (set by main.py)
+_tenant_service: Optional[TenantService] = None
+_user_service: Optional[UserService] = None
+
+# Tenant-scoped service bundles, keyed by tenant_id
+_services_cache: Dict[str, TenantServices] = {}
+
+
+def _evict_tenant_services(tenant_id: str) -> None:
+    """Drop cached services for a tenant whose pool went away."""
+    _services_cache.pop(tenant_id, None)
+
 
 def set_tenant_db_manager(manager: TenantDatabaseManager) -> None:
     """Set the global tenant database manager."""
     global _tenant_db_manager
     _tenant_db_manager = manager
+    _services_cache.clear()
+    manager.add_eviction_listener(_evict_tenant_services)
+
+
+def set_control_services(tenant_service: TenantService, user_service: UserService) -> None:
+    """Set the control database service instances."""
+    global _tenant_service, _user_service
+    _tenant_service = tenant_service
+    _user_service = user_service
+
+
+async def get_tenant_service() -> TenantService:
+    """Dependency returning the tenant service."""
+    if _tenant_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Tenant service not initialized"
+        )
+    return _tenant_service
+
+
+async def get_user_service() -> UserService:
+    """Dependency returning the user service."""
+    if _user_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="User service not initialized"
+        )
+    return _user_service
+
+
+def translate_db_errors(fn):
+    """
+    Translate tenant database lookup errors into HTTP exceptions.
+    
+    ValueError (unknown tenant) becomes 404 and any other failure becomes 500;
+    HTTPExceptions raised by the wrapped function pass through unchanged.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to get tenant database: {str(e)}"
+            )
+    return wrapper
 
 
+@translate_db_errors
 async def get_tenant_db(tenant_id: str) -> Database:
     """
     Get tenant database connection for a tenant.
@@ -44,21 +122,15 @@ async def get_tenant_db(tenant_id: str) -> Database:
             detail="Tenant database manager not initialized"
         )
     
-    try:
-        return await _tenant_db_manager.get_tenant_db(tenant_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get tenant database: {str(e)}"
-        )
+    # Fast path: pool already loaded, no need to await the manager
+    tenant_db = _tenant_db_manager.cache_get(tenant_id)
+    if tenant_db is not None:
+        return tenant_db
+    
+    return await _tenant_db_manager.get_tenant_db(tenant_id)
 
 
-def create_tenant_services(tenant_db: Database):
+def create_tenant_services(tenant_db: Database) -> TenantServices:
     """
     Create tenant-scoped service instances.
     
@@ -66,7 +138,7 @@ def create_tenant_services(tenant_db: Database):
         tenant_db: Tenant database connection
         
     Returns:
-        Tuple of (NodeTypeService, NodeService, RelationshipService)
+        TenantServices of (node_type, node, relationship) services
     """
     # Create tenant-scoped repositories
     node_type_repo = NodeTypeRepository(tenant_db)
@@ -78,20 +150,25 @@ def create_tenant_services(tenant_db: Database):
     node_svc = NodeService(node_repo, node_type_repo)
     relationship_svc = RelationshipService(relationship_repo, node_repo)
     
-    return {
-        "node_type": node_type_svc,
-        "node": node_svc,
-        "relationship": relationship_svc,
-    }
+    return TenantServices(node_type_svc, node_svc, relationship_svc)
 
 
 # Helper function for route handlers
-async def resolve_tenant_services(tenant_id: str) -> dict:
+async def resolve_tenant_services(tenant_id: str) -> TenantServices:
     """
     Resolve tenant services for a given tenant_id.
     
     This is used by route handlers to get tenant-scoped services.
+    Services are built once per tenant pool and reused on later requests.
     """
+    services = _services_cache.get(tenant_id)
+    if services is not None:
+        # Touch the tenant's pool so LRU eviction sees this request too
+        if _tenant_db_manager is not None:
+            _tenant_db_manager.cache_get(tenant_id)
+        return services
     tenant_db = await get_tenant_db(tenant_id)
-    return create_tenant_services(tenant_db)
+    services = create_tenant_services(tenant_db)
+    _services_cache[tenant_id] = services
+    return services
 
@@ -0,0 +1,113 @@
+"""
+ETag support for GET responses.
+
+Successful GET responses get a weak ETag computed from the rendered body, and
+a request whose If-None-Match already names that tag is answered with an
+empty 304 instead of the full body.
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# List pages may be reused briefly by browsers and proxies, then revalidated
+# against their ETag in the background
+LIST_CACHE_HEADERS = {"Cache-Control": "private, max-age=5, stale-while-revalidate=30"}
+
+# Headers describing the body, which a 304 doesn't send
+_BODY_HEADERS = frozenset({b"content-length", b"content-type"})
+
+
+def compute_etag(body: bytes) -> str:
+    """Return a weak ETag for a response body."""
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class ETagMiddleware:
+    """
+    ASGI middleware adding ETags and 304 short-circuits to GET responses.
+
+    Only complete 200 responses (those with a Content-Length) are buffered and
+    tagged; streaming responses and responses that already carry an ETag pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = _header(scope["headers"], b"if-none-match")
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if (
+                    message["status"] == 200
+                    and _header(headers, b"content-length") is not None
+                    and _header(headers, b"etag") is None
+                ):
+                    # Hold the start message until the whole body is known
+                    start = message
+                    return
+                await send(message)
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = compute_etag(body)
+            if if_none_match is not None and etag_matches(if_none_match.decode("latin-1"), etag):
+                # A 304 keeps the headers a 200 would carry (Cache-Control,
+                # Vary, CORS, ...) minus those describing the omitted body
+                headers = [
+                    (key, value)
+                    for key, value in start.get("headers", [])
+                    if key.lower() not in _BODY_HEADERS
+                ]
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [*headers, (b"etag", etag.encode("latin-1"))],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({
+                **start,
+                "headers": [*start.get("headers", []), (b"etag", etag.encode("latin-1"))],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,58 @@
+"""
+Application-level exception handlers for REST API.
+
+Service errors raised from route handlers are translated here, so handlers
+don't need their own try/except blocks. Every error body, including HTTP
+errors raised by dependencies and unexpected 500s, matches ErrorResponse.
+"""
+
+import logging
+from typing import Mapping, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.repository.errors import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+def _error_response(
+    status_code: int, message: str, headers: Optional[Mapping[str, str]] = None
+) -> ORJSONResponse:
+    """Build a JSON error body matching the ErrorResponse model."""
+    return ORJSONResponse(
+        status_code=status_code,
+        content={"error": {"code": status_code, "message": message}},
+        headers=headers,
+    )
+
+
+async def not_found_error_handler(request: Request, exc: NotFoundError) -> ORJSONResponse:
+    """Translate NotFoundError into a 404 response."""
+    return _error_response(404, str(exc))
+
+
+async def value_error_handler(request: Request, exc: ValueError) -> ORJSONResponse:
+    """Translate ValueError into a 400 response."""
+    return _error_response(400, str(exc))
+
+
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ORJSONResponse:
+    """Render HTTP exceptions (e.g. from dependencies) in the same error shape."""
+    return _error_response(exc.status_code, str(exc.detail), exc.headers)
+
+
+async def unhandled_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
+    """Translate any other exception into a JSON 500 response."""
+    logger.error(f"Unhandled error on {request.method} {request.url.path}: {exc}")
+    return _error_response(500, str(exc))
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Register service error handlers on the application."""
+    app.add_exception_handler(NotFoundError, not_found_error_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    app.add_exception_handler(Exception, unhandled_error_handler)
@@ -3,30 +3,74 @@ Pydantic models for request/response validation.
 """
 
 from typing import List, Optional
-from pydantic import BaseModel, Field
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+class APIModel(BaseModel):
+    """Base model shared by all request/response models."""
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def _require_json(value: str) -> str:
+    """Reject malformed JSON text; an empty string means "not provided"."""
+    if value:
+        try:
+            orjson.loads(value)
+        except orjson.JSONDecodeError:
+            raise ValueError("must be valid JSON") from None
+    return value
+
+
+class PartialUpdateModel(APIModel):
+    """
+    Base for partial update requests.
+    
+    Explicit nulls are read as "not provided" and become empty strings, which
+    the service layer treats as "leave unchanged".
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def _none_to_empty(cls, data):
+        if isinstance(data, dict):
+            return {k: ("" if v is None else v) for k, v in data.items()}
+        return data
 
 
 # ============================================================================
 # Pagination Models
 # ============================================================================
 
-class PaginationParams(BaseModel):
+# Page tokens are short URL-safe base64 strings, so anything longer or with
+# other characters is rejected before it reaches a handler
+PAGE_TOKEN_MAX_LENGTH = 256
+PAGE_TOKEN_PATTERN = r"^[A-Za-z0-9_\-=]*$"
+
+
+class PaginationParams(APIModel):
     """Pagination query parameters."""
     page_size: int = Field(default=10, ge=1, le=100, description="Number of items per page")
-    page_token: str = Field(default="", description="Token for the next page")
+    page_token: str = Field(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    )
 
 
-class PaginationResult(BaseModel):
+class PaginationResult(APIModel):
     """Pagination result metadata."""
     next_page_token: str = Field(default="", description="Token for the next page")
-    total_count: int = Field(default=0, ge=0, description="Total number of items")
+    total_count: Optional[int] = Field(default=None, ge=0, description="Total number of items; null for tenant and user lists unless include_total is set")
 
 
 # ============================================================================
 # Tenant Models
 # ============================================================================
 
-class TenantBase(BaseModel):
+class TenantBase(APIModel):
     """Base tenant model."""
     slug: str = Field(..., min_length=1, description="Unique tenant slug")
     name: str = Field(..., min_length=1, description="Tenant name")
@@ -37,14 +81,14 @@ class TenantCreate(TenantBase):
     pass
 
 
-class TenantUpdate(BaseModel):
+class TenantUpdate(PartialUpdateModel):
     """Request model for updating a tenant."""
-    slug: Optional[str] = Field(default=None, description="New tenant slug")
-    name: Optional[str] = Field(default=None, description="New tenant name")
-    status: Optional[str] = Field(default=None, description="New tenant status")
+    slug: str = Field(default="", description="New tenant slug")
+    name: str = Field(default="", description="New tenant name")
+    status: str = Field(default="", description="New tenant status")
 
 
-class Tenant(BaseModel):
+class Tenant(APIModel):
     """Tenant response model."""
     id: str = Field(..., description="Tenant ID")
     slug: str = Field(..., description="Tenant slug")
@@ -54,12 +98,12 @@ class Tenant(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-class TenantResponse(BaseModel):
+class TenantResponse(APIModel):
     """Single tenant response wrapper."""
     tenant: Tenant
 
 
-class TenantListResponse(BaseModel):
+class TenantListResponse(APIModel):
     """List tenants response wrapper."""
     tenants: List[Tenant]
     pagination: PaginationResult
@@ -69,10 +113,10 @@ class TenantListResponse(BaseModel):
 # User Models
 # ============================================================================
 
-class UserBase(BaseModel):
+class UserBase(APIModel):
     """Base user model."""
-    email: str = Field(..., description="User email address")
-    display_name: str = Field(..., description="User display name")
+    email: str = Field(..., min_length=1, description="User email address")
+    display_name: str = Field(..., min_length=1, description="User display name")
 
 
 class UserCreate(UserBase):
@@ -80,13 +124,13 @@ class UserCreate(UserBase):
     pass
 
 
-class UserUpdate(BaseModel):
+class UserUpdate(PartialUpdateModel):
     """Request model for updating a user."""
-    email: Optional[str] = Field(default=None, description="New user email")
-    display_name: Optional[str] = Field(default=None, description="New user display name")
+    email: str = Field(default="", description="New user email")
+    display_name: str = Field(default="", description="New user display name")
 
 
-class User(BaseModel):
+class User(APIModel):
     """User response model."""
     id: str = Field(..., description="User ID")
     email: str = Field(..., description="User email")
@@ -95,12 +139,12 @@ class User(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-class UserResponse(BaseModel):
+class UserResponse(APIModel):
     """Single user response wrapper."""
     user: User
 
 
-class UserListResponse(BaseModel):
+class UserListResponse(APIModel):
     """List users response wrapper."""
     users: List[User]
     pagination: PaginationResult
@@ -110,13 +154,13 @@ class UserListResponse(BaseModel):
 # TenantUser Models
 # ============================================================================
 
-class TenantUserAdd(BaseModel):
+class TenantUserAdd(APIModel):
     """Request model for adding a user to a tenant."""
-    user_id: str = Field(..., description="User ID to add")
+    user_id: str = Field(..., min_length=1, description="User ID to add")
     role: str = Field(default="member", description="User role in the tenant")
 
 
-class TenantUser(BaseModel):
+class TenantUser(APIModel):
     """Tenant user response model."""
     tenant_id: str = Field(..., description="Tenant ID")
     user_id: str = Field(..., description="User ID")
@@ -124,12 +168,12 @@ class TenantUser(BaseModel):
     status: str = Field(..., description="Membership status")
 
 
-class TenantUserResponse(BaseModel):
+class TenantUserResponse(APIModel):
     """Single tenant user response wrapper."""
     tenant_user: TenantUser
 
 
-class TenantUserListResponse(BaseModel):
+class TenantUserListResponse(APIModel):
     """List tenant users response wrapper."""
     tenant_users: List[TenantUser]
     pagination: PaginationResult
@@ -139,11 +183,16 @@ class TenantUserListResponse(BaseModel):
 # NodeType Models
 # ============================================================================
 
-class NodeTypeBase(BaseModel):
+class NodeTypeBase(APIModel):
     """Base node type model."""
     name: str = Field(..., min_length=1, description="Node type name")
-    description: Optional[str] = Field(default="", description="Node type description")
-    json_schema: Optional[str] = Field(default="", alias="schema", description="JSON schema for node data validation")
+    description: str = Field(default="", description="Node type description")
+    json_schema: str = Field(default="", alias="schema", description="JSON schema for node data validation")
+
+    @field_validator("description", "json_schema", mode="before")
+    @classmethod
+    def _none_to_empty(cls, value):
+        return "" if value is None else value
 
 
 class NodeTypeCreate(NodeTypeBase):
@@ -151,14 +200,14 @@ class NodeTypeCreate(NodeTypeBase):
     pass
 
 
-class NodeTypeUpdate(BaseModel):
+class NodeTypeUpdate(PartialUpdateModel):
     """Request model for updating a node type."""
-    name: Optional[str] = Field(default=None, description="New node type name")
-    description: Optional[str] = Field(default=None, description="New node type description")
-    json_schema: Optional[str] = Field(default=None, alias="schema", description="New JSON schema")
+    name: str = Field(default="", description="New node type name")
+    description: str = Field(default="", description="New node type description")
+    json_schema: str = Field(default="", alias="schema", description="New JSON schema")
 
 
-class NodeType(BaseModel):
+class NodeType(APIModel):
     """Node type response model."""
     id: str = Field(..., description="Node type ID")
     tenant_id: str = Field(..., description="Tenant ID")
@@ -169,12 +218,12 @@ class NodeType(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-class NodeTypeResponse(BaseModel):
+class NodeTypeResponse(APIModel):
     """Single node type response wrapper."""
     node_type: NodeType
 
 
-class NodeTypeListResponse(BaseModel):
+class NodeTypeListResponse(APIModel):
     """List node types response wrapper."""
     node_types: List[NodeType]
     pagination: PaginationResult
@@ -184,10 +233,20 @@ class NodeTypeListResponse(BaseModel):
 # Node Models
 # ============================================================================
 
-class NodeBase(BaseModel):
+class NodeBase(APIModel):
     """Base node model."""
-    node_type_id: str = Field(..., description="Node type ID")
-    data: Optional[str] = Field(default="{}", description="Node data as JSON string")
+    node_type_id: str = Field(..., min_length=1, description="Node type ID")
+    data: str = Field(default="{}", description="Node data as JSON string")
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _empty_data_to_object(cls, value):
+        return value or "{}"
+
+    @field_validator("data")
+    @classmethod
+    def _data_is_json(cls, value):
+        return _require_json(value)
 
 
 class NodeCreate(NodeBase):
@@ -195,12 +254,17 @@ class NodeCreate(NodeBase):
     pass
 
 
-class NodeUpdate(BaseModel):
+class NodeUpdate(PartialUpdateModel):
     """Request model for updating a node."""
-    data: Optional[str] = Field(default=None, description="New node data as JSON string")
+    data: str = Field(default="", description="New node data as JSON string")
+
+    @field_validator("data")
+    @classmethod
+    def _data_is_json(cls, value):
+        return _require_json(value)
 
 
-class Node(BaseModel):
+class Node(APIModel):
     """Node response model."""
     id: str = Field(..., description="Node ID")
     tenant_id: str = Field(..., description="Tenant ID")
@@ -210,12 +274,12 @@ class Node(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-class NodeResponse(BaseModel):
+class NodeResponse(APIModel):
     """Single node response wrapper."""
     node: Node
 
 
-class NodeListResponse(BaseModel):
+class NodeListResponse(APIModel):
     """List nodes response wrapper."""
     nodes: List[Node]
     pagination: PaginationResult
@@ -225,12 +289,22 @@ class NodeListResponse(BaseModel):
 # Relationship Models
 # ============================================================================
 
-class RelationshipBase(BaseModel):
+class RelationshipBase(APIModel):
     """Base relationship model."""
-    source_node_id: str = Field(..., description="Source node ID")
-    target_node_id: str = Field(..., description="Target node ID")
-    relationship_type: str = Field(..., description="Relationship type")
-    data: Optional[str] = Field(default="{}", description="Relationship data as JSON string")
+    source_node_id: str = Field(..., min_length=1, description="Source node ID")
+    target_node_id: str = Field(..., min_length=1, description="Target node ID")
+    relationship_type: str = Field(..., min_length=1, description="Relationship type")
+    data: str = Field(default="{}", description="Relationship data as JSON string")
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _empty_data_to_object(cls, value):
+        return value or "{}"
+
+    @field_validator("data")
+    @classmethod
+    def _data_is_json(cls, value):
+        return _require_json(value)
 
 
 class RelationshipCreate(RelationshipBase):
@@ -238,13 +312,18 @@ class RelationshipCreate(RelationshipBase):
     pass
 
 
-class RelationshipUpdate(BaseModel):
+class RelationshipUpdate(PartialUpdateModel):
     """Request model for updating a relationship."""
-    relationship_type: Optional[str] = Field(default=None, description="New relationship type")
-    data: Optional[str] = Field(default=None, description="New relationship data as JSON string")
+    relationship_type: str = Field(default="", description="New relationship type")
+    data: str = Field(default="", description="New relationship data as JSON string")
+
+    @field_validator("data")
+    @classmethod
+    def _data_is_json(cls, value):
+        return _require_json(value)
 
 
-class Relationship(BaseModel):
+class Relationship(APIModel):
     """Relationship response model."""
     id: str = Field(..., description="Relationship ID")
     tenant_id: str = Field(..., description="Tenant ID")
@@ -256,12 +335,12 @@ class Relationship(BaseModel):
     updated_at: str = Field(..., description="Last update timestamp")
 
 
-class RelationshipResponse(BaseModel):
+class RelationshipResponse(APIModel):
     """Single relationship response wrapper."""
     relationship: Relationship
 
 
-class RelationshipListResponse(BaseModel):
+class RelationshipListResponse(APIModel):
     """List relationships response wrapper."""
     relationships: List[Relationship]
     pagination: PaginationResult
@@ -271,13 +350,13 @@ class RelationshipListResponse(BaseModel):
 # Error Models
 # ============================================================================
 
-class ErrorDetail(BaseModel):
+class ErrorDetail(APIModel):
     """Error detail model."""
     code: int = Field(..., description="Error code")
     message: str = Field(..., description="Error message")
 
 
-class ErrorResponse(BaseModel):
+class ErrorResponse(APIModel):
     """Error response model."""
     error: ErrorDetail
 
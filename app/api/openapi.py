@@ -0,0 +1,9 @@
+"""
+OpenAPI response entries shared by the REST routers.
+"""
+
+from app.api.models import ErrorResponse
+
+# Spread into a route's ``responses`` alongside its own 2xx and 404 entries
+INVALID_PARAMETERS = {400: {"description": "Invalid parameters", "model": ErrorResponse}}
+SERVER_ERROR = {500: {"description": "Internal server error", "model": ErrorResponse}}
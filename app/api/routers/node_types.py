@@ -2,7 +2,8 @@
 NodeType REST API router.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 
 from app.api.models import (
     NodeTypeCreate,
@@ -10,9 +11,12 @@ from app.api.models import (
     NodeTypeResponse,
     NodeTypeListResponse,
     ErrorResponse,
+    PAGE_TOKEN_MAX_LENGTH,
+    PAGE_TOKEN_PATTERN,
 )
-from app.api.errors import handle_service_error
-from app.api.dependencies import resolve_tenant_services
+from app.api.dependencies import TenantServices, resolve_tenant_services
+from app.api.etag import LIST_CACHE_HEADERS
+from app.api.openapi import INVALID_PARAMETERS, SERVER_ERROR
 
 
 router = APIRouter(prefix="/tenants/{tenant_id}/node-types", tags=["Node Types"])
@@ -20,76 +24,82 @@ router = APIRouter(prefix="/tenants/{tenant_id}/node-types", tags=["Node Types"]
 
 @router.post(
     "",
-    response_model=NodeTypeResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Create a node type",
     description="Create a new node type within a tenant.",
     responses={
-        201: {"description": "Node type created successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        201: {"description": "Node type created successfully", "model": NodeTypeResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def create_node_type(tenant_id: str, node_type: NodeTypeCreate):
+async def create_node_type(
+    tenant_id: str,
+    node_type: NodeTypeCreate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Create a new node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_type_obj = await services["node_type"].create(
-            node_type.name,
-            node_type.description or "",
-            node_type.json_schema or ""
-        )
-        return NodeTypeResponse(node_type=node_type_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    node_type_obj = await services.node_type.create(
+        node_type.name,
+        node_type.description,
+        node_type.json_schema
+    )
+    payload = {"node_type": node_type_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @router.get(
     "/{node_type_id}",
-    response_model=NodeTypeResponse,
+    response_class=ORJSONResponse,
     summary="Get a node type",
     description="Get a node type by its ID within a tenant.",
     responses={
-        200: {"description": "Node type found"},
+        200: {"description": "Node type found", "model": NodeTypeResponse},
         404: {"description": "Node type or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def get_node_type(tenant_id: str, node_type_id: str):
+async def get_node_type(
+    tenant_id: str,
+    node_type_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Get a node type by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_type_obj = await services["node_type"].get_by_id(node_type_id)
-        return NodeTypeResponse(node_type=node_type_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    node_type_obj = await services.node_type.get_by_id(node_type_id)
+    payload = {"node_type": node_type_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.put(
     "/{node_type_id}",
-    response_model=NodeTypeResponse,
+    response_class=ORJSONResponse,
     summary="Update a node type",
     description="Update an existing node type. Only provided fields will be updated.",
     responses={
-        200: {"description": "Node type updated successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        200: {"description": "Node type updated successfully", "model": NodeTypeResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Node type or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def update_node_type(tenant_id: str, node_type_id: str, node_type: NodeTypeUpdate):
+async def update_node_type(
+    tenant_id: str,
+    node_type_id: str,
+    node_type: NodeTypeUpdate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Update an existing node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        # Only pass non-None values to service (service layer handles empty strings)
-        name = node_type.name or ""
-        description = node_type.description or ""
-        schema = node_type.json_schema or ""
-        node_type_obj = await services["node_type"].update(node_type_id, name, description, schema)
-        return NodeTypeResponse(node_type=node_type_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    # Empty strings mean "not provided" (service layer leaves those fields unchanged)
+    node_type_obj = await services.node_type.update(
+        node_type_id,
+        node_type.name,
+        node_type.description,
+        node_type.json_schema
+    )
+    payload = {"node_type": node_type_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.delete(
@@ -100,43 +110,47 @@ async def update_node_type(tenant_id: str, node_type_id: str, node_type: NodeTyp
     responses={
         204: {"description": "Node type deleted successfully"},
         404: {"description": "Node type or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def delete_node_type(tenant_id: str, node_type_id: str):
+async def delete_node_type(
+    tenant_id: str,
+    node_type_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Delete a node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["node_type"].delete(node_type_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await services.node_type.delete(node_type_id)
+    return None
 
 
 @router.get(
     "",
-    response_model=NodeTypeListResponse,
+    response_class=ORJSONResponse,
     summary="List node types",
     description="List all node types within a tenant with pagination.",
     responses={
-        200: {"description": "List of node types"},
+        200: {"description": "List of node types", "model": NodeTypeListResponse},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_node_types(
     tenant_id: str,
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    services: TenantServices = Depends(resolve_tenant_services),
 ):
     """List node types for a tenant."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_types, pagination = await services["node_type"].list(page_size, page_token)
-        return NodeTypeListResponse(
-            node_types=[nt.to_dict() for nt in node_types],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    node_types, pagination = await services.node_type.list(page_size, page_token)
+    payload = {
+        "node_types": node_types,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
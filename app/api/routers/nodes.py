@@ -2,7 +2,8 @@
 Node REST API router.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
 from app.api.models import (
@@ -11,9 +12,12 @@ from app.api.models import (
     NodeResponse,
     NodeListResponse,
     ErrorResponse,
+    PAGE_TOKEN_MAX_LENGTH,
+    PAGE_TOKEN_PATTERN,
 )
-from app.api.errors import handle_service_error
-from app.api.dependencies import resolve_tenant_services
+from app.api.dependencies import TenantServices, resolve_tenant_services
+from app.api.etag import LIST_CACHE_HEADERS
+from app.api.openapi import INVALID_PARAMETERS, SERVER_ERROR
 
 
 router = APIRouter(prefix="/tenants/{tenant_id}/nodes", tags=["Nodes"])
@@ -21,70 +25,73 @@ router = APIRouter(prefix="/tenants/{tenant_id}/nodes", tags=["Nodes"])
 
 @router.post(
     "",
-    response_model=NodeResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Create a node",
     description="Create a new node within a tenant.",
     responses={
-        201: {"description": "Node created successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        201: {"description": "Node created successfully", "model": NodeResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Tenant or node type not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def create_node(tenant_id: str, node: NodeCreate):
+async def create_node(
+    tenant_id: str,
+    node: NodeCreate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Create a new node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_obj = await services["node"].create(node.node_type_id, node.data or "{}")
-        return NodeResponse(node=node_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    node_obj = await services.node.create(node.node_type_id, node.data)
+    payload = {"node": node_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @router.get(
     "/{node_id}",
-    response_model=NodeResponse,
+    response_class=ORJSONResponse,
     summary="Get a node",
     description="Get a node by its ID within a tenant.",
     responses={
-        200: {"description": "Node found"},
+        200: {"description": "Node found", "model": NodeResponse},
         404: {"description": "Node or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def get_node(tenant_id: str, node_id: str):
+async def get_node(
+    tenant_id: str,
+    node_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Get a node by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_obj = await services["node"].get_by_id(node_id)
-        return NodeResponse(node=node_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    node_obj = await services.node.get_by_id(node_id)
+    payload = {"node": node_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.put(
     "/{node_id}",
-    response_model=NodeResponse,
+    response_class=ORJSONResponse,
     summary="Update a node",
     description="Update an existing node. Only provided fields will be updated.",
     responses={
-        200: {"description": "Node updated successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        200: {"description": "Node updated successfully", "model": NodeResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Node or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def update_node(tenant_id: str, node_id: str, node: NodeUpdate):
+async def update_node(
+    tenant_id: str,
+    node_id: str,
+    node: NodeUpdate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Update an existing node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        # Only pass non-None values to service (service layer handles empty strings)
-        data = node.data or ""
-        node_obj = await services["node"].update(node_id, data)
-        return NodeResponse(node=node_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    # Empty data means "not provided" (service layer leaves it unchanged)
+    node_obj = await services.node.update(node_id, node.data)
+    payload = {"node": node_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.delete(
@@ -95,44 +102,48 @@ async def update_node(tenant_id: str, node_id: str, node: NodeUpdate):
     responses={
         204: {"description": "Node deleted successfully"},
         404: {"description": "Node or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def delete_node(tenant_id: str, node_id: str):
+async def delete_node(
+    tenant_id: str,
+    node_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Delete a node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["node"].delete(node_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await services.node.delete(node_id)
+    return None
 
 
 @router.get(
     "",
-    response_model=NodeListResponse,
+    response_class=ORJSONResponse,
     summary="List nodes",
     description="List all nodes within a tenant with optional filtering by node type.",
     responses={
-        200: {"description": "List of nodes"},
+        200: {"description": "List of nodes", "model": NodeListResponse},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_nodes(
     tenant_id: str,
     node_type_id: Optional[str] = Query(default=None, description="Filter by node type ID"),
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    services: TenantServices = Depends(resolve_tenant_services),
 ):
     """List nodes for a tenant."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        nodes, pagination = await services["node"].list(node_type_id or None, page_size, page_token)
-        return NodeListResponse(
-            nodes=[n.to_dict() for n in nodes],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    nodes, pagination = await services.node.list(node_type_id or None, page_size, page_token)
+    payload = {
+        "nodes": nodes,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
@@ -2,7 +2,8 @@
 Relationship REST API router.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
 from app.api.models import (
@@ -11,9 +12,12 @@ from app.api.models import (
     RelationshipResponse,
     RelationshipListResponse,
     ErrorResponse,
+    PAGE_TOKEN_MAX_LENGTH,
+    PAGE_TOKEN_PATTERN,
 )
-from app.api.errors import handle_service_error
-from app.api.dependencies import resolve_tenant_services
+from app.api.dependencies import TenantServices, resolve_tenant_services
+from app.api.etag import LIST_CACHE_HEADERS
+from app.api.openapi import INVALID_PARAMETERS, SERVER_ERROR
 
 
 router = APIRouter(prefix="/tenants/{tenant_id}/relationships", tags=["Relationships"])
@@ -21,76 +25,82 @@ router = APIRouter(prefix="/tenants/{tenant_id}/relationships", tags=["Relations
 
 @router.post(
     "",
-    response_model=RelationshipResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Create a relationship",
     description="Create a new relationship between two nodes within a tenant.",
     responses={
-        201: {"description": "Relationship created successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        201: {"description": "Relationship created successfully", "model": RelationshipResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Tenant or nodes not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def create_relationship(tenant_id: str, relationship: RelationshipCreate):
+async def create_relationship(
+    tenant_id: str,
+    relationship: RelationshipCreate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Create a new relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rel_obj = await services["relationship"].create(
-            relationship.source_node_id,
-            relationship.target_node_id,
-            relationship.relationship_type,
-            relationship.data or "{}"
-        )
-        return RelationshipResponse(relationship=rel_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    rel_obj = await services.relationship.create(
+        relationship.source_node_id,
+        relationship.target_node_id,
+        relationship.relationship_type,
+        relationship.data
+    )
+    payload = {"relationship": rel_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @router.get(
     "/{relationship_id}",
-    response_model=RelationshipResponse,
+    response_class=ORJSONResponse,
     summary="Get a relationship",
     description="Get a relationship by its ID within a tenant.",
     responses={
-        200: {"description": "Relationship found"},
+        200: {"description": "Relationship found", "model": RelationshipResponse},
         404: {"description": "Relationship or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def get_relationship(tenant_id: str, relationship_id: str):
+async def get_relationship(
+    tenant_id: str,
+    relationship_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Get a relationship by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rel_obj = await services["relationship"].get_by_id(relationship_id)
-        return RelationshipResponse(relationship=rel_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    rel_obj = await services.relationship.get_by_id(relationship_id)
+    payload = {"relationship": rel_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.put(
     "/{relationship_id}",
-    response_model=RelationshipResponse,
+    response_class=ORJSONResponse,
     summary="Update a relationship",
     description="Update an existing relationship. Only provided fields will be updated.",
     responses={
-        200: {"description": "Relationship updated successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        200: {"description": "Relationship updated successfully", "model": RelationshipResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Relationship or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def update_relationship(tenant_id: str, relationship_id: str, relationship: RelationshipUpdate):
+async def update_relationship(
+    tenant_id: str,
+    relationship_id: str,
+    relationship: RelationshipUpdate,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Update an existing relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        # Only pass non-None values to service (service layer handles empty strings)
-        rel_type = relationship.relationship_type or ""
-        data = relationship.data or ""
-        rel_obj = await services["relationship"].update(relationship_id, rel_type, data)
-        return RelationshipResponse(relationship=rel_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    # Empty strings mean "not provided" (service layer leaves those fields unchanged)
+    rel_obj = await services.relationship.update(
+        relationship_id,
+        relationship.relationship_type,
+        relationship.data
+    )
+    payload = {"relationship": rel_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.delete(
@@ -101,28 +111,28 @@ async def update_relationship(tenant_id: str, relationship_id: str, relationship
     responses={
         204: {"description": "Relationship deleted successfully"},
         404: {"description": "Relationship or tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def delete_relationship(tenant_id: str, relationship_id: str):
+async def delete_relationship(
+    tenant_id: str,
+    relationship_id: str,
+    services: TenantServices = Depends(resolve_tenant_services),
+):
     """Delete a relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["relationship"].delete(relationship_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await services.relationship.delete(relationship_id)
+    return None
 
 
 @router.get(
     "",
-    response_model=RelationshipListResponse,
+    response_class=ORJSONResponse,
     summary="List relationships",
     description="List all relationships within a tenant with optional filtering.",
     responses={
-        200: {"description": "List of relationships"},
+        200: {"description": "List of relationships", "model": RelationshipListResponse},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_relationships(
@@ -131,22 +141,26 @@ async def list_relationships(
     target_node_id: Optional[str] = Query(default=None, description="Filter by target node ID"),
     relationship_type: Optional[str] = Query(default=None, description="Filter by relationship type"),
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    services: TenantServices = Depends(resolve_tenant_services),
 ):
     """List relationships for a tenant."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rels, pagination = await services["relationship"].list(
-            source_node_id,
-            target_node_id,
-            relationship_type,
-            page_size,
-            page_token
-        )
-        return RelationshipListResponse(
-            relationships=[r.to_dict() for r in rels],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    rels, pagination = await services.relationship.list(
+        source_node_id,
+        target_node_id,
+        relationship_type,
+        page_size,
+        page_token
+    )
+    payload = {
+        "relationships": rels,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
@@ -2,7 +2,8 @@
 Tenant REST API router.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 
 from app.api.models import (
     TenantCreate,
@@ -10,92 +11,81 @@ from app.api.models import (
     TenantResponse,
     TenantListResponse,
     ErrorResponse,
+    PAGE_TOKEN_MAX_LENGTH,
+    PAGE_TOKEN_PATTERN,
 )
-from app.api.errors import handle_service_error
-
-# Service instances will be set by main.py
-_tenant_service = None
-
-
-def set_tenant_service(service):
-    """Set the tenant service instance."""
-    global _tenant_service
-    _tenant_service = service
-
+from app.api.dependencies import get_tenant_service
+from app.api.etag import LIST_CACHE_HEADERS
+from app.api.openapi import INVALID_PARAMETERS, SERVER_ERROR
+from app.service import TenantService
 
 router = APIRouter(prefix="/tenants", tags=["Tenants"])
 
 
 @router.post(
     "",
-    response_model=TenantResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Create a tenant",
     description="Create a new tenant with the given slug and name.",
     responses={
-        201: {"description": "Tenant created successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        201: {"description": "Tenant created successfully", "model": TenantResponse},
+        **INVALID_PARAMETERS,
+        **SERVER_ERROR,
     },
 )
-async def create_tenant(tenant: TenantCreate):
+async def create_tenant(
+    tenant: TenantCreate,
+    service: TenantService = Depends(get_tenant_service),
+):
     """Create a new tenant."""
-    try:
-        if _tenant_service is None:
-            raise RuntimeError("Tenant service not initialized")
-        tenant_obj = await _tenant_service.create(tenant.slug, tenant.name)
-        return TenantResponse(tenant=tenant_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    tenant_obj = await service.create(tenant.slug, tenant.name)
+    payload = {"tenant": tenant_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @router.get(
     "/{tenant_id}",
-    response_model=TenantResponse,
+    response_class=ORJSONResponse,
     summary="Get a tenant",
     description="Get a tenant by its ID.",
     responses={
-        200: {"description": "Tenant found"},
+        200: {"description": "Tenant found", "model": TenantResponse},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def get_tenant(tenant_id: str):
+async def get_tenant(
+    tenant_id: str,
+    service: TenantService = Depends(get_tenant_service),
+):
     """Get a tenant by ID."""
-    try:
-        if _tenant_service is None:
-            raise RuntimeError("Tenant service not initialized")
-        tenant_obj = await _tenant_service.get_by_id(tenant_id)
-        return TenantResponse(tenant=tenant_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    tenant_obj = await service.get_by_id(tenant_id)
+    payload = {"tenant": tenant_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.put(
     "/{tenant_id}",
-    response_model=TenantResponse,
+    response_class=ORJSONResponse,
     summary="Update a tenant",
     description="Update an existing tenant. Only provided fields will be updated.",
     responses={
-        200: {"description": "Tenant updated successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        200: {"description": "Tenant updated successfully", "model": TenantResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def update_tenant(tenant_id: str, tenant: TenantUpdate):
+async def update_tenant(
+    tenant_id: str,
+    tenant: TenantUpdate,
+    service: TenantService = Depends(get_tenant_service),
+):
     """Update an existing tenant."""
-    try:
-        if _tenant_service is None:
-            raise RuntimeError("Tenant service not initialized")
-        # Only pass non-None values to service (service layer handles empty strings)
-        slug = tenant.slug or ""
-        name = tenant.name or ""
-        status = tenant.status or ""
-        tenant_obj = await _tenant_service.update(tenant_id, slug, name, status)
-        return TenantResponse(tenant=tenant_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    tenant_obj = await service.update(tenant_id, tenant.slug, tenant.name, tenant.status)
+    payload = {"tenant": tenant_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.delete(
@@ -106,43 +96,45 @@ async def update_tenant(tenant_id: str, tenant: TenantUpdate):
     responses={
         204: {"description": "Tenant deleted successfully"},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def delete_tenant(tenant_id: str):
+async def delete_tenant(
+    tenant_id: str,
+    service: TenantService = Depends(get_tenant_service),
+):
     """Delete a tenant."""
-    try:
-        if _tenant_service is None:
-            raise RuntimeError("Tenant service not initialized")
-        await _tenant_service.delete(tenant_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await service.delete(tenant_id)
+    return None
 
 
 @router.get(
     "",
-    response_model=TenantListResponse,
+    response_class=ORJSONResponse,
     summary="List tenants",
     description="List all tenants with pagination.",
     responses={
-        200: {"description": "List of tenants"},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        200: {"description": "List of tenants", "model": TenantListResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_tenants(
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    include_total: bool = Query(default=False, description="Also count all matching items (slower)"),
+    service: TenantService = Depends(get_tenant_service),
 ):
     """List tenants with pagination."""
-    try:
-        if _tenant_service is None:
-            raise RuntimeError("Tenant service not initialized")
-        tenants, pagination = await _tenant_service.list(page_size, page_token)
-        return TenantListResponse(
-            tenants=[t.to_dict() for t in tenants],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    tenants, pagination = await service.list(page_size, page_token, include_total)
+    payload = {
+        "tenants": tenants,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
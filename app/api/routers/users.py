@@ -2,7 +2,8 @@
 User REST API router.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 
 from app.api.models import (
     UserCreate,
@@ -13,91 +14,81 @@ from app.api.models import (
     TenantUserResponse,
     TenantUserListResponse,
     ErrorResponse,
+    PAGE_TOKEN_MAX_LENGTH,
+    PAGE_TOKEN_PATTERN,
 )
-from app.api.errors import handle_service_error
-
-# Service instances will be set by main.py
-_user_service = None
-
-
-def set_user_service(service):
-    """Set the user service instance."""
-    global _user_service
-    _user_service = service
-
+from app.api.dependencies import get_user_service
+from app.api.etag import LIST_CACHE_HEADERS
+from app.api.openapi import INVALID_PARAMETERS, SERVER_ERROR
+from app.service import UserService
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.post(
     "",
-    response_model=UserResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Create a user",
     description="Create a new user with the given email and display name.",
     responses={
-        201: {"description": "User created successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        201: {"description": "User created successfully", "model": UserResponse},
+        **INVALID_PARAMETERS,
+        **SERVER_ERROR,
     },
 )
-async def create_user(user: UserCreate):
+async def create_user(
+    user: UserCreate,
+    service: UserService = Depends(get_user_service),
+):
     """Create a new user."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        user_obj = await _user_service.create(user.email, user.display_name)
-        return UserResponse(user=user_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    user_obj = await service.create(user.email, user.display_name)
+    payload = {"user": user_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @router.get(
     "/{user_id}",
-    response_model=UserResponse,
+    response_class=ORJSONResponse,
     summary="Get a user",
     description="Get a user by their ID.",
     responses={
-        200: {"description": "User found"},
+        200: {"description": "User found", "model": UserResponse},
         404: {"description": "User not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def get_user(user_id: str):
+async def get_user(
+    user_id: str,
+    service: UserService = Depends(get_user_service),
+):
     """Get a user by ID."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        user_obj = await _user_service.get_by_id(user_id)
-        return UserResponse(user=user_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    user_obj = await service.get_by_id(user_id)
+    payload = {"user": user_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.put(
     "/{user_id}",
-    response_model=UserResponse,
+    response_class=ORJSONResponse,
     summary="Update a user",
     description="Update an existing user. Only provided fields will be updated.",
     responses={
-        200: {"description": "User updated successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        200: {"description": "User updated successfully", "model": UserResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "User not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def update_user(user_id: str, user: UserUpdate):
+async def update_user(
+    user_id: str,
+    user: UserUpdate,
+    service: UserService = Depends(get_user_service),
+):
     """Update an existing user."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        # Only pass non-None values to service (service layer handles empty strings)
-        email = user.email or ""
-        display_name = user.display_name or ""
-        user_obj = await _user_service.update(user_id, email, display_name)
-        return UserResponse(user=user_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    user_obj = await service.update(user_id, user.email, user.display_name)
+    payload = {"user": user_obj.to_dict()}
+    return ORJSONResponse(payload)
 
 
 @router.delete(
@@ -108,45 +99,47 @@ async def update_user(user_id: str, user: UserUpdate):
     responses={
         204: {"description": "User deleted successfully"},
         404: {"description": "User not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def delete_user(user_id: str):
+async def delete_user(
+    user_id: str,
+    service: UserService = Depends(get_user_service),
+):
     """Delete a user."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        await _user_service.delete(user_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await service.delete(user_id)
+    return None
 
 
 @router.get(
     "",
-    response_model=UserListResponse,
+    response_class=ORJSONResponse,
     summary="List users",
     description="List all users with pagination.",
     responses={
-        200: {"description": "List of users"},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        200: {"description": "List of users", "model": UserListResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_users(
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    include_total: bool = Query(default=False, description="Also count all matching items (slower)"),
+    service: UserService = Depends(get_user_service),
 ):
     """List users with pagination."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        users, pagination = await _user_service.list(page_size, page_token)
-        return UserListResponse(
-            users=[u.to_dict() for u in users],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    users, pagination = await service.list(page_size, page_token, include_total)
+    payload = {
+        "users": users,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
 
 # ============================================================================
@@ -158,26 +151,26 @@ tenant_users_router = APIRouter(prefix="/tenants/{tenant_id}/users", tags=["Tena
 
 @tenant_users_router.post(
     "",
-    response_model=TenantUserResponse,
+    response_class=ORJSONResponse,
     status_code=201,
     summary="Add user to tenant",
     description="Add a user to a tenant with the specified role.",
     responses={
-        201: {"description": "User added to tenant successfully"},
-        400: {"description": "Invalid parameters", "model": ErrorResponse},
+        201: {"description": "User added to tenant successfully", "model": TenantUserResponse},
+        **INVALID_PARAMETERS,
         404: {"description": "Tenant or user not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def add_user_to_tenant(tenant_id: str, tenant_user: TenantUserAdd):
+async def add_user_to_tenant(
+    tenant_id: str,
+    tenant_user: TenantUserAdd,
+    service: UserService = Depends(get_user_service),
+):
     """Add a user to a tenant."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        tenant_user_obj = await _user_service.add_to_tenant(tenant_id, tenant_user.user_id, tenant_user.role)
-        return TenantUserResponse(tenant_user=tenant_user_obj.to_dict())
-    except Exception as e:
-        raise handle_service_error(e)
+    tenant_user_obj = await service.add_to_tenant(tenant_id, tenant_user.user_id, tenant_user.role)
+    payload = {"tenant_user": tenant_user_obj.to_dict()}
+    return ORJSONResponse(payload, status_code=201)
 
 
 @tenant_users_router.delete(
@@ -188,45 +181,50 @@ async def add_user_to_tenant(tenant_id: str, tenant_user: TenantUserAdd):
     responses={
         204: {"description": "User removed from tenant successfully"},
         404: {"description": "Tenant or user not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
-async def remove_user_from_tenant(tenant_id: str, user_id: str):
+async def remove_user_from_tenant(
+    tenant_id: str,
+    user_id: str,
+    service: UserService = Depends(get_user_service),
+):
     """Remove a user from a tenant."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        await _user_service.remove_from_tenant(tenant_id, user_id)
-        return None
-    except Exception as e:
-        raise handle_service_error(e)
+    await service.remove_from_tenant(tenant_id, user_id)
+    return None
 
 
 @tenant_users_router.get(
     "",
-    response_model=TenantUserListResponse,
+    response_class=ORJSONResponse,
     summary="List tenant users",
     description="List all users in a tenant with pagination.",
     responses={
-        200: {"description": "List of tenant users"},
+        200: {"description": "List of tenant users", "model": TenantUserListResponse},
         404: {"description": "Tenant not found", "model": ErrorResponse},
-        500: {"description": "Internal server error", "model": ErrorResponse},
+        **SERVER_ERROR,
     },
 )
 async def list_tenant_users(
     tenant_id: str,
     page_size: int = Query(default=10, ge=1, le=100, description="Number of items per page"),
-    page_token: str = Query(default="", description="Token for the next page"),
+    page_token: str = Query(
+        default="",
+        max_length=PAGE_TOKEN_MAX_LENGTH,
+        pattern=PAGE_TOKEN_PATTERN,
+        description="Token for the next page",
+    ),
+    include_total: bool = Query(default=False, description="Also count all matching items (slower)"),
+    service: UserService = Depends(get_user_service),
 ):
     """List users in a tenant."""
-    try:
-        if _user_service is None:
-            raise RuntimeError("User service not initialized")
-        tenant_users, pagination = await _user_service.list_tenant_users(tenant_id, page_size, page_token)
-        return TenantUserListResponse(
-            tenant_users=[tu.to_dict() for tu in tenant_users],
-            pagination=pagination.to_dict()
-        )
-    except Exception as e:
-        raise handle_service_error(e)
+    tenant_users, pagination = await service.list_tenant_users(
+        tenant_id, page_size, page_token, include_total
+    )
+    payload = {
+        "tenant_users": tenant_users,
+        "pagination": pagination,
+    }
+    # orjson serializes the entity and ListResult dataclasses natively
+    return ORJSONResponse(payload, headers=LIST_CACHE_HEADERS)
 
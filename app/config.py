@@ -3,11 +3,33 @@ Database configuration module.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 
-@dataclass
+# Maps every non-alphanumeric ASCII character to "_" for tenant slug sanitizing
+_ASCII_SLUG_TABLE = str.maketrans({c: "_" for c in map(chr, range(128)) if not c.isalnum()})
+
+
+@lru_cache(maxsize=4096)
+def _tenant_db_name(prefix: str, tenant_slug: str) -> str:
+    """Build a tenant database name from a prefix and a sanitized slug."""
+    # Sanitize slug: lowercase, replace non-alphanumeric with underscore
+    slug = tenant_slug.lower()
+    if slug.isascii():
+        sanitized = slug.translate(_ASCII_SLUG_TABLE)
+    else:
+        sanitized = "".join(c if c.isalnum() else "_" for c in slug)
+    return f"{prefix}{sanitized}"
+
+
+def _default_pool_max_size() -> int:
+    """Default pool ceiling: scale with CPU count, never below 10."""
+    return max(10, (os.cpu_count() or 1) * 4)
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """Database configuration."""
     host: str = "localhost"
@@ -21,6 +43,28 @@ class Config:
     # Legacy: kept for backward compatibility during migration
     db_name: str = "dbaas"
     ssl_mode: str = "disable"
+    # Control database pool sizing. pool_min_size also applies to tenant pools.
+    pool_min_size: int = 1
+    pool_max_size: int = field(default_factory=_default_pool_max_size)
+    # Ceiling for each tenant pool. Up to max_cached_tenant_pools of these are
+    # open at once, so tenant_pool_max_size * max_cached_tenant_pools (plus
+    # pool_max_size) must stay below the server's max_connections.
+    tenant_pool_max_size: int = 5
+    # Per-connection prepared statement cache. Larger caches let hot queries
+    # skip parse/plan at the cost of some server memory per connection.
+    statement_cache_size: int = 1024
+    # Seconds to wait for a new connection to be established before failing
+    connect_timeout: float = 30.0
+    # Close idle pooled connections after this many seconds (0 disables)
+    max_inactive_connection_lifetime: float = 300.0
+    # Run a SELECT 1 probe after creating a pool. Disabling it saves a round
+    # trip per pool; connection errors then surface on first use instead.
+    verify_on_connect: bool = True
+    # Maximum number of tenant pools kept open at once. The least recently
+    # used pool is closed when the limit is exceeded (0 disables the limit).
+    max_cached_tenant_pools: int = 100
+    # Number of tenant pools to open at startup (0 disables prewarming)
+    prewarm_tenant_pools: int = 0
 
     def connection_string(self, database: Optional[str] = None) -> str:
         """Return PostgreSQL connection string."""
@@ -35,9 +79,7 @@ class Config:
     
     def tenant_db_name(self, tenant_slug: str) -> str:
         """Generate tenant database name from slug."""
-        # Sanitize slug: lowercase, replace non-alphanumeric with underscore
-        sanitized = "".join(c if c.isalnum() else "_" for c in tenant_slug.lower())
-        return f"{self.tenant_db_prefix}{sanitized}"
+        return _tenant_db_name(self.tenant_db_prefix, tenant_slug)
 
 
 def default_config() -> Config:
@@ -47,13 +89,24 @@ def default_config() -> Config:
 
 def config_from_env() -> Config:
     """Load configuration from environment variables."""
+    env = os.environ
+    pool_max_size = env.get("DB_POOL_MAX_SIZE")
     return Config(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=int(os.getenv("DB_PORT", "5432")),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "postgres"),
-        control_db_name=os.getenv("DB_CONTROL_NAME", "dbaas_control"),
-        tenant_db_prefix=os.getenv("DB_TENANT_PREFIX", "dbaas_tenant_"),
-        db_name=os.getenv("DB_NAME", "dbaas"),  # Legacy, kept for compatibility
-        ssl_mode=os.getenv("DB_SSL_MODE", "disable"),
+        host=env.get("DB_HOST", "localhost"),
+        port=int(env.get("DB_PORT", "5432")),
+        user=env.get("DB_USER", "postgres"),
+        password=env.get("DB_PASSWORD", "postgres"),
+        control_db_name=env.get("DB_CONTROL_NAME", "dbaas_control"),
+        tenant_db_prefix=env.get("DB_TENANT_PREFIX", "dbaas_tenant_"),
+        db_name=env.get("DB_NAME", "dbaas"),  # Legacy, kept for compatibility
+        ssl_mode=env.get("DB_SSL_MODE", "disable"),
+        pool_min_size=int(env.get("DB_POOL_MIN_SIZE", "1")),
+        pool_max_size=int(pool_max_size) if pool_max_size else _default_pool_max_size(),
+        tenant_pool_max_size=int(env.get("DB_TENANT_POOL_MAX_SIZE", "5")),
+        statement_cache_size=int(env.get("DB_STATEMENT_CACHE_SIZE", "1024")),
+        max_inactive_connection_lifetime=float(env.get("DB_MAX_INACTIVE_CONNECTION_LIFETIME", "300")),
+        connect_timeout=float(env.get("DB_CONNECT_TIMEOUT", "30")),
+        verify_on_connect=env.get("DB_VERIFY_ON_CONNECT", "true").lower() == "true",
+        max_cached_tenant_pools=int(env.get("DB_MAX_TENANT_POOLS", "100")),
+        prewarm_tenant_pools=int(env.get("DB_PREWARM_TENANT_POOLS", "0")),
     )
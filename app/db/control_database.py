@@ -7,17 +7,36 @@ Each tenant has its own isolated database for tenant-specific data.
 
 import logging
 import os
-import ssl
 from pathlib import Path
-from typing import Optional
+from typing import Tuple
 
 import asyncpg
 
 from app.config import Config
-from app.db.database import Database
+from app.db.database import Database, init_connection, resolve_ssl, validate_db_name
 
 logger = logging.getLogger(__name__)
 
+CONTROL_MIGRATIONS_DIR = Path(__file__).parent / "control_migrations"
+
+
+def _load_control_migrations() -> Tuple[Tuple[str, str], ...]:
+    """Read control migrations from disk as sorted (version, sql) pairs."""
+    try:
+        with os.scandir(CONTROL_MIGRATIONS_DIR) as entries:
+            up_files = sorted(e.name for e in entries if e.name.endswith(".up.sql"))
+    except FileNotFoundError:
+        logger.warning(f"Control migrations directory not found: {CONTROL_MIGRATIONS_DIR}")
+        return ()
+    return tuple(
+        (filename[:-len(".up.sql")], (CONTROL_MIGRATIONS_DIR / filename).read_text())
+        for filename in up_files
+    )
+
+
+# Migration files ship with the code, so they're read once at import
+_CONTROL_MIGRATIONS = _load_control_migrations()
+
 
 async def connect_control_db(cfg: Config) -> Database:
     """
@@ -30,30 +49,26 @@ async def connect_control_db(cfg: Config) -> Database:
     - Tenant-User memberships
     """
     try:
-        # Map SSL mode to asyncpg ssl parameter
-        ssl_context = None
-        if cfg.ssl_mode == "require":
-            ssl_context = "require"
-        elif cfg.ssl_mode == "prefer":
-            ssl_context = "prefer"
-        elif cfg.ssl_mode == "verify-ca" or cfg.ssl_mode == "verify-full":
-            ssl_context = ssl.create_default_context()
-        # "disable" is the default (ssl_context = None)
-
         pool = await asyncpg.create_pool(
             host=cfg.host,
             port=cfg.port,
             user=cfg.user,
             password=cfg.password,
             database=cfg.control_db_name,
-            min_size=1,
-            max_size=10,
-            ssl=ssl_context,
+            min_size=cfg.pool_min_size,
+            max_size=cfg.pool_max_size,
+            statement_cache_size=cfg.statement_cache_size,
+            max_cached_statement_lifetime=0,
+            max_inactive_connection_lifetime=cfg.max_inactive_connection_lifetime,
+            ssl=resolve_ssl(cfg.ssl_mode),
+            timeout=cfg.connect_timeout,
+            init=init_connection,
         )
         
         # Test the connection
-        async with pool.acquire() as conn:
-            await conn.execute("SELECT 1")
+        if cfg.verify_on_connect:
+            async with pool.acquire() as conn:
+                await conn.execute("SELECT 1")
         
         logger.info(f"Connected to control database: {cfg.control_db_name}")
         return Database(pool)
@@ -63,42 +78,44 @@ async def connect_control_db(cfg: Config) -> Database:
 
 async def run_control_migrations(db: Database) -> None:
     """Apply all control database migrations."""
+    if not _CONTROL_MIGRATIONS:
+        return
+
     async with db.pool.acquire() as conn:
-        # Create migrations tracking table
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS schema_migrations (
-                version TEXT PRIMARY KEY,
-                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        # Get which of the shipped migrations are already applied. On a
+        # migrated database this is the only round trip.
+        try:
+            rows = await conn.fetch(
+                "SELECT version FROM schema_migrations WHERE version = ANY($1::text[])",
+                [version for version, _ in _CONTROL_MIGRATIONS]
             )
-        """)
-
-        # Get already applied migrations
-        rows = await conn.fetch("SELECT version FROM schema_migrations")
-        applied = {row["version"] for row in rows}
-
-        # Read and apply migrations
-        migrations_dir = Path(__file__).parent / "control_migrations"
-        if not migrations_dir.exists():
-            logger.warning(f"Control migrations directory not found: {migrations_dir}")
-            return
-        
-        up_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith(".up.sql")])
+        except asyncpg.exceptions.UndefinedTableError:
+            # First run: create the migrations tracking table
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version TEXT PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """)
+            rows = []
+        applied = frozenset(row[0] for row in rows)
 
-        for filename in up_files:
-            version = filename.replace(".up.sql", "")
+        pending = []
+        for version, content in _CONTROL_MIGRATIONS:
             if version in applied:
                 logger.info(f"Control migration {version} already applied, skipping")
                 continue
-
             logger.info(f"Applying control migration {version}")
-            content = (migrations_dir / filename).read_text()
-            
-            # Execute the migration in a transaction
+            pending.append((version, content))
+
+        if pending:
+            # Apply every pending migration in one transaction and one
+            # simple-query round trip, then record them with a single insert
             async with conn.transaction():
-                await conn.execute(content)
+                await conn.execute("\n;\n".join(content for _, content in pending))
                 await conn.execute(
-                    "INSERT INTO schema_migrations (version) VALUES ($1)",
-                    version
+                    "INSERT INTO schema_migrations (version) SELECT unnest($1::text[])",
+                    [version for version, _ in pending]
                 )
         
         logger.info("Control database migrations completed")
@@ -110,16 +127,9 @@ async def ensure_control_database_exists(cfg: Config) -> None:
     
     This requires connecting to the default 'postgres' database first.
     """
+    validate_db_name(cfg.control_db_name)
+
     try:
-        # Connect to default postgres database to create control database
-        ssl_context = None
-        if cfg.ssl_mode == "require":
-            ssl_context = "require"
-        elif cfg.ssl_mode == "prefer":
-            ssl_context = "prefer"
-        elif cfg.ssl_mode == "verify-ca" or cfg.ssl_mode == "verify-full":
-            ssl_context = ssl.create_default_context()
-        
         # Connect to default postgres database
         conn = await asyncpg.connect(
             host=cfg.host,
@@ -127,7 +137,8 @@ async def ensure_control_database_exists(cfg: Config) -> None:
             user=cfg.user,
             password=cfg.password,
             database="postgres",  # Connect to default database
-            ssl=ssl_context,
+            ssl=resolve_ssl(cfg.ssl_mode),
+            timeout=cfg.connect_timeout,
         )
         
         try:
@@ -140,15 +151,16 @@ async def ensure_control_database_exists(cfg: Config) -> None:
             if not db_exists:
                 logger.info(f"Creating control database: {cfg.control_db_name}")
                 # Terminate any existing connections to the database (if it's being dropped/recreated)
-                # Note: We need to use string formatting here since database names can't be parameterized
                 await conn.execute(
-                    f"""
+                    """
                     SELECT pg_terminate_backend(pid) 
                     FROM pg_stat_activity 
-                    WHERE datname = '{cfg.control_db_name}' AND pid <> pg_backend_pid()
-                    """
+                    WHERE datname = $1 AND pid <> pg_backend_pid()
+                    """,
+                    cfg.control_db_name
                 )
-                # Create the database (must use string formatting, not parameterized query)
+                # Create the database (identifiers can't be parameterized, so
+                # the name was validated above)
                 await conn.execute(f'CREATE DATABASE "{cfg.control_db_name}"')
                 logger.info(f"Control database created: {cfg.control_db_name}")
             else:
@@ -0,0 +1,5 @@
+-- Migration: 002_add_keyset_pagination_indexes.up.sql
+-- Support keyset pagination ordered by (created_at, id), newest first
+
+CREATE INDEX IF NOT EXISTS idx_tenants_created_at_id ON tenants(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at DESC, id DESC);
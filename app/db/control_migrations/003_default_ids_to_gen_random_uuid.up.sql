@@ -0,0 +1,5 @@
+-- Migration: 003_default_ids_to_gen_random_uuid.up.sql
+-- Generate tenant and user ids in the database (gen_random_uuid is built in since PostgreSQL 13)
+
+ALTER TABLE tenants ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE users ALTER COLUMN id SET DEFAULT gen_random_uuid();
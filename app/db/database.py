@@ -5,9 +5,12 @@ Database connection and migrations module.
 import asyncio
 import logging
 import os
+import re
 import ssl
+import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Union
 
 import asyncpg
 
@@ -15,10 +18,66 @@ from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Database names are interpolated into CREATE DATABASE, so only allow what
+# the configured names and Config.tenant_db_name produce: word characters
+# (Unicode letters, digits, underscore)
+_DB_NAME_RE = re.compile(r"\w+")
+# Postgres truncates identifiers longer than NAMEDATALEN - 1 bytes
+_MAX_IDENTIFIER_BYTES = 63
+
+
+def validate_db_name(db_name: str) -> None:
+    """Raise ValueError unless db_name is safe to use as a quoted identifier."""
+    if not _DB_NAME_RE.fullmatch(db_name):
+        raise ValueError(f"Invalid database name: {db_name!r}")
+    if len(db_name.encode("utf-8")) > _MAX_IDENTIFIER_BYTES:
+        raise ValueError(
+            f"Database name exceeds {_MAX_IDENTIFIER_BYTES} bytes: {db_name!r}"
+        )
+
+
+@lru_cache(maxsize=4)
+def resolve_ssl(ssl_mode: str) -> Union[ssl.SSLContext, str, None]:
+    """
+    Map an SSL mode to the asyncpg ssl parameter.
+    
+    Verifying modes share one SSLContext, so the system trust store is only
+    loaded once per process.
+    """
+    if ssl_mode == "require":
+        return "require"
+    if ssl_mode == "prefer":
+        return "prefer"
+    if ssl_mode == "verify-ca" or ssl_mode == "verify-full":
+        return ssl.create_default_context()
+    # "disable" is the default
+    return None
+
+
+def _encode_uuid(value) -> str:
+    # Validate client side so malformed ids still fail as asyncpg's client
+    # DataError (a ValueError) rather than as a server-side syntax error
+    return str(uuid.UUID(str(value)))
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Per-connection setup for every application pool.
+    
+    UUID columns are decoded straight to str, which is what the repository
+    models hold, instead of uuid.UUID objects that would each need a str()
+    per row.
+    """
+    await conn.set_type_codec(
+        "uuid", encoder=_encode_uuid, decoder=str, schema="pg_catalog", format="text"
+    )
+
 
 class Database:
     """Database connection pool wrapper."""
 
+    __slots__ = ("pool",)
+
     def __init__(self, pool: asyncpg.Pool):
         self.pool = pool
 
@@ -30,29 +89,25 @@ class Database:
 async def connect(cfg: Config) -> Database:
     """Create a new database connection pool."""
     try:
-        # Map SSL mode to asyncpg ssl parameter
-        ssl_context = None
-        if cfg.ssl_mode == "require":
-            ssl_context = "require"
-        elif cfg.ssl_mode == "prefer":
-            ssl_context = "prefer"
-        elif cfg.ssl_mode == "verify-ca" or cfg.ssl_mode == "verify-full":
-            ssl_context = ssl.create_default_context()
-        # "disable" is the default (ssl_context = None)
-
         pool = await asyncpg.create_pool(
             host=cfg.host,
             port=cfg.port,
             user=cfg.user,
             password=cfg.password,
             database=cfg.db_name,
-            min_size=1,
-            max_size=10,
-            ssl=ssl_context,
+            min_size=cfg.pool_min_size,
+            max_size=cfg.pool_max_size,
+            statement_cache_size=cfg.statement_cache_size,
+            max_cached_statement_lifetime=0,
+            max_inactive_connection_lifetime=cfg.max_inactive_connection_lifetime,
+            ssl=resolve_ssl(cfg.ssl_mode),
+            timeout=cfg.connect_timeout,
+            init=init_connection,
         )
         # Test the connection
-        async with pool.acquire() as conn:
-            await conn.execute("SELECT 1")
+        if cfg.verify_on_connect:
+            async with pool.acquire() as conn:
+                await conn.execute("SELECT 1")
         
         return Database(pool)
     except Exception as e:
@@ -70,27 +125,40 @@ async def run_migrations(db: Database) -> None:
             )
         """)
 
-        # Get already applied migrations
-        rows = await conn.fetch("SELECT version FROM schema_migrations")
-        applied = {row["version"] for row in rows}
-
         # Read and apply migrations
         migrations_dir = Path(__file__).parent / "migrations"
-        up_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith(".up.sql")])
+        # File I/O runs in a worker thread so it doesn't block the event loop
+        filenames = await asyncio.to_thread(os.listdir, migrations_dir)
+        up_files = sorted(f for f in filenames if f.endswith(".up.sql"))
+
+        # Get which of the on-disk migrations are already applied
+        rows = await conn.fetch(
+            "SELECT version FROM schema_migrations WHERE version = ANY($1::text[])",
+            [f.replace(".up.sql", "") for f in up_files]
+        )
+        applied = {row[0] for row in rows}
+
+        # Prepare the tracking insert once and reuse it for every migration
+        record_stmt = await conn.prepare(
+            "INSERT INTO schema_migrations (version) VALUES ($1)"
+        )
 
+        pending = []
         for filename in up_files:
             version = filename.replace(".up.sql", "")
             if version in applied:
                 logger.info(f"Migration {version} already applied, skipping")
                 continue
+            pending.append((version, migrations_dir / filename))
+
+        # Read every pending file up front, concurrently in worker threads
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(path.read_text, "utf-8") for _, path in pending)
+        )
 
+        for (version, _), content in zip(pending, contents):
             logger.info(f"Applying migration {version}")
-            content = (migrations_dir / filename).read_text()
-            
             # Execute the migration in a transaction
             async with conn.transaction():
                 await conn.execute(content)
-                await conn.execute(
-                    "INSERT INTO schema_migrations (version) VALUES ($1)",
-                    version
-                )
+                await record_stmt.fetchval(version)
@@ -5,20 +5,40 @@ Manages connection pools to tenant-specific databases and handles
 database creation and migrations on-demand.
 """
 
+import asyncio
 import logging
 import os
-import ssl
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import asyncpg
 
 from app.config import Config
-from app.db.database import Database
+from app.db.database import Database, init_connection, resolve_ssl, validate_db_name
 from app.db.control_database import connect_control_db
 
 logger = logging.getLogger(__name__)
 
+TENANT_MIGRATIONS_DIR = Path(__file__).parent / "tenant_migrations"
+
+def _load_tenant_migrations() -> Tuple[Tuple[str, str], ...]:
+    """Read tenant migrations from disk as sorted (version, sql) pairs."""
+    try:
+        with os.scandir(TENANT_MIGRATIONS_DIR) as entries:
+            up_files = sorted(e.name for e in entries if e.name.endswith(".up.sql"))
+    except FileNotFoundError:
+        logger.warning(f"Tenant migrations directory not found: {TENANT_MIGRATIONS_DIR}")
+        return ()
+    return tuple(
+        (filename[:-len(".up.sql")], (TENANT_MIGRATIONS_DIR / filename).read_text())
+        for filename in up_files
+    )
+
+
+# Migration files ship with the code, so they're read once at import
+_TENANT_MIGRATIONS = _load_tenant_migrations()
+
 
 class TenantDatabaseManager:
     """
@@ -42,8 +62,102 @@ class TenantDatabaseManager:
         """
         self.cfg = cfg
         self.control_db = control_db
-        self._tenant_pools: Dict[str, Database] = {}  # tenant_id -> Database pool
-        self._pool_lock = None  # Will use asyncio.Lock if needed for thread safety
+        # Set when control_db was opened lazily by this manager, which then owns it
+        self._owns_control_db = False
+        self._control_db_lock = asyncio.Lock()
+        # Small pool on the "postgres" database for CREATE DATABASE, opened lazily
+        self._admin_pool: Optional[asyncpg.Pool] = None
+        self._admin_pool_lock = asyncio.Lock()
+        # tenant_id -> Database pool, least recently used first
+        self._tenant_pools: "OrderedDict[str, Database]" = OrderedDict()
+        self._max_cached_pools = cfg.max_cached_tenant_pools
+        self._closing_tasks: Set[asyncio.Task] = set()
+        # tenant_id -> migration versions known to be applied to its database
+        self._applied_migrations: Dict[str, FrozenSet[str]] = {}
+        # tenant_id -> (lock held while that tenant's pool is being created,
+        # number of coroutines holding or waiting on it)
+        self._creation_locks: Dict[str, List] = {}
+        self._eviction_listeners: List[Callable[[str], None]] = []
+
+    async def _ensure_control_db(self) -> Database:
+        """Return the control database, connecting once if none was provided."""
+        if self.control_db is not None:
+            return self.control_db
+        async with self._control_db_lock:
+            if self.control_db is None:
+                self.control_db = await connect_control_db(self.cfg)
+                self._owns_control_db = True
+        return self.control_db
+
+    async def _get_admin_pool(self) -> asyncpg.Pool:
+        """Return the admin pool, creating it on first use."""
+        if self._admin_pool is not None:
+            return self._admin_pool
+        async with self._admin_pool_lock:
+            if self._admin_pool is None:
+                self._admin_pool = await asyncpg.create_pool(
+                    host=self.cfg.host,
+                    port=self.cfg.port,
+                    user=self.cfg.user,
+                    password=self.cfg.password,
+                    database="postgres",  # Connect to default database
+                    min_size=0,
+                    max_size=2,
+                    ssl=resolve_ssl(self.cfg.ssl_mode),
+                    timeout=self.cfg.connect_timeout,
+                )
+        return self._admin_pool
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback invoked with a tenant_id whenever its pool is
+        evicted, closed, or replaced.
+        
+        Used by callers that cache objects bound to a tenant's pool so they
+        can drop them when the pool goes away.
+        """
+        self._eviction_listeners.append(listener)
+
+    def _notify_evicted(self, tenant_id: str) -> None:
+        """Notify eviction listeners that a tenant's pool is no longer valid."""
+        for listener in self._eviction_listeners:
+            try:
+                listener(tenant_id)
+            except Exception as e:
+                logger.error(f"Eviction listener failed for tenant {tenant_id}: {e}")
+
+    def cache_get(self, tenant_id: str) -> Optional[Database]:
+        """Return the cached pool for a tenant, or None if it isn't loaded yet."""
+        db = self._tenant_pools.get(tenant_id)
+        if db is not None:
+            self._tenant_pools.move_to_end(tenant_id)
+        return db
+
+    def _cache_put(self, tenant_id: str, db: Database) -> None:
+        """Cache a tenant pool, closing the least recently used one if over capacity."""
+        self._tenant_pools[tenant_id] = db
+        self._tenant_pools.move_to_end(tenant_id)
+        if self._max_cached_pools <= 0:
+            return
+        while len(self._tenant_pools) > self._max_cached_pools:
+            evicted_id, evicted = self._tenant_pools.popitem(last=False)
+            self._notify_evicted(evicted_id)
+            self._close_in_background(evicted_id, evicted)
+            logger.info(f"Evicted least recently used pool for tenant {evicted_id}")
+
+    def _close_in_background(self, tenant_id: str, db: Database) -> None:
+        """Close a dropped pool without blocking the caller on in-flight queries."""
+        task = asyncio.create_task(self._close_evicted(tenant_id, db))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def _close_evicted(self, tenant_id: str, db: Database) -> None:
+        """Close a pool dropped from the cache."""
+        try:
+            await db.close()
+            logger.debug(f"Closed pool for tenant {tenant_id}")
+        except Exception as e:
+            logger.error(f"Error closing pool for tenant {tenant_id}: {e}")
 
     async def get_tenant_db(self, tenant_id: str) -> Database:
         """
@@ -63,19 +177,44 @@ class TenantDatabaseManager:
             Database connection pool for the tenant
         """
         # Check cache first
-        if tenant_id in self._tenant_pools:
-            return self._tenant_pools[tenant_id]
-
+        cached = self.cache_get(tenant_id)
+        if cached is not None:
+            return cached
+
+        # Only one coroutine per tenant creates the pool; the rest wait for it
+        entry = self._creation_locks.get(tenant_id)
+        if entry is None:
+            entry = self._creation_locks[tenant_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                cached = self.cache_get(tenant_id)
+                if cached is not None:
+                    return cached
+                return await self._load_tenant_db(tenant_id)
+        finally:
+            # Drop the lock once nobody holds or awaits it so the dict stays
+            # bounded. lock.locked() can't tell: it is already False when a
+            # woken waiter hasn't yet acquired.
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._creation_locks[tenant_id]
+
+    async def _load_tenant_db(self, tenant_id: str) -> Database:
+        """Look up, create if needed, migrate, connect and cache a tenant's pool."""
         # Get control database connection (use provided or create new)
-        control_db = self.control_db
-        if not control_db:
-            control_db = await connect_control_db(self.cfg)
+        control_db = await self._ensure_control_db()
 
         # Look up tenant database name from control DB
         async with control_db.pool.acquire() as conn:
-            # First, get tenant slug to determine database name
+            # Fetch the tenant slug and its database mapping in one round trip
             tenant_row = await conn.fetchrow(
-                "SELECT slug FROM tenants WHERE id = $1",
+                """
+                SELECT t.slug, td.database_name, td.status
+                FROM tenants t
+                LEFT JOIN tenant_databases td ON td.tenant_id = t.id
+                WHERE t.id = $1
+                """,
                 tenant_id
             )
             if not tenant_row:
@@ -84,29 +223,92 @@ class TenantDatabaseManager:
             slug = tenant_row["slug"]
             db_name = self.cfg.tenant_db_name(slug)
 
-            # Check if database mapping exists
-            db_mapping = await conn.fetchrow(
-                "SELECT database_name, status FROM tenant_databases WHERE tenant_id = $1",
-                tenant_id
-            )
-
-            if db_mapping and db_mapping["status"] == "active":
+            if tenant_row["status"] == "active":
                 # Database mapping exists, connect to it
-                db_name = db_mapping["database_name"]
+                db_name = tenant_row["database_name"]
             else:
                 # Need to create tenant database
                 await self._create_tenant_database(tenant_id, slug, db_name, control_db, conn)
+                self._applied_migrations.pop(tenant_id, None)
 
         # Connect to tenant database and run migrations
         tenant_db = await self._connect_tenant_database(db_name)
         await self._run_tenant_migrations(tenant_id, tenant_db)
 
         # Cache the pool
-        self._tenant_pools[tenant_id] = tenant_db
+        self._cache_put(tenant_id, tenant_db)
         logger.info(f"Cached connection pool for tenant {tenant_id} (database: {db_name})")
 
         return tenant_db
 
+    async def prewarm(self, tenant_ids: Optional[List[str]] = None, limit: int = 32) -> int:
+        """
+        Open pools for active tenant databases ahead of their first request.
+        
+        Mappings are fetched in one control DB query and the pools are
+        connected and migrated concurrently. Failures are logged and skipped;
+        those tenants fall back to lazy initialization in get_tenant_db.
+        
+        Args:
+            tenant_ids: Tenants to warm. Defaults to the most recently created
+                        active tenant databases.
+            limit: Maximum number of pools to open (also capped by the cache size)
+            
+        Returns:
+            Number of pools opened
+        """
+        if self._max_cached_pools > 0:
+            limit = min(limit, self._max_cached_pools)
+        if limit <= 0:
+            return 0
+
+        control_db = await self._ensure_control_db()
+
+        async with control_db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT tenant_id::text AS tenant_id, database_name
+                FROM tenant_databases
+                WHERE status = 'active'
+                  AND ($1::uuid[] IS NULL OR tenant_id = ANY($1::uuid[]))
+                ORDER BY created_at DESC
+                LIMIT $2
+                """,
+                tenant_ids,
+                limit
+            )
+
+        rows = [row for row in rows if row["tenant_id"] not in self._tenant_pools]
+        results = await asyncio.gather(
+            *(self._connect_tenant_database(row["database_name"]) for row in rows),
+            return_exceptions=True,
+        )
+        pools = []
+        for row, result in zip(rows, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to prewarm pool for tenant {row['tenant_id']}: {result}")
+            else:
+                pools.append((row["tenant_id"], result))
+
+        migrated = await asyncio.gather(
+            *(self._run_tenant_migrations(tenant_id, db) for tenant_id, db in pools),
+            return_exceptions=True,
+        )
+        warmed = 0
+        for (tenant_id, db), result in zip(pools, migrated):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to migrate tenant {tenant_id} during prewarm: {result}")
+                await self._close_evicted(tenant_id, db)
+            elif tenant_id in self._tenant_pools:
+                # A request got there first; keep its pool
+                await self._close_evicted(tenant_id, db)
+            else:
+                self._cache_put(tenant_id, db)
+                warmed += 1
+
+        logger.info(f"Prewarmed {warmed} tenant database pools")
+        return warmed
+
     async def create_tenant_database(
         self,
         tenant_id: str,
@@ -131,19 +333,22 @@ class TenantDatabaseManager:
         db_name = self.cfg.tenant_db_name(slug)
 
         # Use provided control DB or get cached one
-        control_db = control_db or self.control_db
-        if not control_db:
-            control_db = await connect_control_db(self.cfg)
+        control_db = control_db or await self._ensure_control_db()
 
         async with control_db.pool.acquire() as conn:
             await self._create_tenant_database(tenant_id, slug, db_name, control_db, conn)
 
+        # The database may be new, so check its migrations from scratch
+        self._applied_migrations.pop(tenant_id, None)
+
         # Connect to tenant database and run migrations
         tenant_db = await self._connect_tenant_database(db_name)
         await self._run_tenant_migrations(tenant_id, tenant_db)
 
-        # Cache the pool
-        self._tenant_pools[tenant_id] = tenant_db
+        # Cache the pool (dropping anything bound to a previous pool)
+        if tenant_id in self._tenant_pools:
+            self._notify_evicted(tenant_id)
+        self._cache_put(tenant_id, tenant_db)
         logger.info(f"Created and cached tenant database: {db_name} for tenant {tenant_id}")
 
         return tenant_db
@@ -157,26 +362,11 @@ class TenantDatabaseManager:
         control_conn
     ) -> None:
         """Internal method to create tenant database and record mapping."""
+        validate_db_name(db_name)
         try:
-            # Connect to postgres database to create new database
-            ssl_context = None
-            if self.cfg.ssl_mode == "require":
-                ssl_context = "require"
-            elif self.cfg.ssl_mode == "prefer":
-                ssl_context = "prefer"
-            elif self.cfg.ssl_mode == "verify-ca" or self.cfg.ssl_mode == "verify-full":
-                ssl_context = ssl.create_default_context()
-
-            admin_conn = await asyncpg.connect(
-                host=self.cfg.host,
-                port=self.cfg.port,
-                user=self.cfg.user,
-                password=self.cfg.password,
-                database="postgres",  # Connect to default database
-                ssl=ssl_context,
-            )
-
-            try:
+            # Use the maintenance database to create the new database
+            admin_pool = await self._get_admin_pool()
+            async with admin_pool.acquire() as admin_conn:
                 # Check if database already exists
                 db_exists = await admin_conn.fetchval(
                     "SELECT 1 FROM pg_database WHERE datname = $1",
@@ -190,68 +380,60 @@ class TenantDatabaseManager:
                     logger.info(f"Tenant database created: {db_name}")
                 else:
                     logger.info(f"Tenant database already exists: {db_name}")
-            finally:
-                await admin_conn.close()
-
-            # Record database mapping in control database
-            await control_conn.execute(
-                """
-                INSERT INTO tenant_databases (tenant_id, database_name)
-                VALUES ($1, $2)
-                ON CONFLICT (tenant_id) DO UPDATE
-                SET database_name = EXCLUDED.database_name,
-                    status = 'active'
-                """,
-                tenant_id,
-                db_name
-            )
-            logger.info(f"Recorded tenant database mapping: {tenant_id} -> {db_name}")
-
         except asyncpg.exceptions.DuplicateDatabaseError:
-            # Database already exists, that's fine
+            # Created concurrently after the existence check, that's fine
             logger.info(f"Tenant database already exists: {db_name}")
-            # Still record the mapping
-            await control_conn.execute(
-                """
-                INSERT INTO tenant_databases (tenant_id, database_name)
-                VALUES ($1, $2)
-                ON CONFLICT (tenant_id) DO UPDATE
-                SET database_name = EXCLUDED.database_name,
-                    status = 'active'
-                """,
-                tenant_id,
-                db_name
-            )
         except Exception as e:
             logger.error(f"Failed to create tenant database {db_name}: {e}")
             raise
 
+        await self._record_database_mapping(control_conn, tenant_id, db_name)
+
+    async def _record_database_mapping(self, control_conn, tenant_id: str, db_name: str) -> None:
+        """Record (or reactivate) a tenant's database mapping in the control database."""
+        await control_conn.execute(
+            """
+            INSERT INTO tenant_databases (tenant_id, database_name)
+            VALUES ($1, $2)
+            ON CONFLICT (tenant_id) DO UPDATE
+            SET database_name = EXCLUDED.database_name,
+                status = 'active'
+            """,
+            tenant_id,
+            db_name
+        )
+        logger.info(f"Recorded tenant database mapping: {tenant_id} -> {db_name}")
+
     async def _connect_tenant_database(self, db_name: str) -> Database:
         """Connect to a tenant database and return Database wrapper."""
         try:
             # Map SSL mode to asyncpg ssl parameter
-            ssl_context = None
-            if self.cfg.ssl_mode == "require":
-                ssl_context = "require"
-            elif self.cfg.ssl_mode == "prefer":
-                ssl_context = "prefer"
-            elif self.cfg.ssl_mode == "verify-ca" or self.cfg.ssl_mode == "verify-full":
-                ssl_context = ssl.create_default_context()
+            ssl_context = resolve_ssl(self.cfg.ssl_mode)
 
+            # Tenant pools get their own small ceiling since many are open at once
+            max_size = self.cfg.tenant_pool_max_size
+            min_size = min(self.cfg.pool_min_size, max_size)
             pool = await asyncpg.create_pool(
                 host=self.cfg.host,
                 port=self.cfg.port,
                 user=self.cfg.user,
                 password=self.cfg.password,
                 database=db_name,
-                min_size=1,
-                max_size=10,
+                min_size=min_size,
+                max_size=max_size,
+                statement_cache_size=self.cfg.statement_cache_size,
+                max_cached_statement_lifetime=0,
+                max_inactive_connection_lifetime=self.cfg.max_inactive_connection_lifetime,
                 ssl=ssl_context,
+                timeout=self.cfg.connect_timeout,
+                init=init_connection,
             )
 
-            # Test the connection
-            async with pool.acquire() as conn:
-                await conn.execute("SELECT 1")
+            # create_pool has already connected min_size connections, so only
+            # probe when it opened none
+            if self.cfg.verify_on_connect and min_size == 0:
+                async with pool.acquire() as conn:
+                    await conn.execute("SELECT 1")
 
             return Database(pool)
         except Exception as e:
@@ -264,10 +446,14 @@ class TenantDatabaseManager:
         Tracks which migrations have been applied to which tenant database
         in the control database's tenant_migrations table.
         """
+        # Nothing to check if this tenant was already seen fully migrated
+        known = self._applied_migrations.get(tenant_id)
+        if known is not None and all(version in known for version, _ in _TENANT_MIGRATIONS):
+            logger.debug(f"Tenant {tenant_id} migrations already up to date")
+            return
+
         # Get control database connection
-        control_db = self.control_db
-        if not control_db:
-            control_db = await connect_control_db(self.cfg)
+        control_db = await self._ensure_control_db()
 
         # Get migrations already applied to this tenant (from control DB)
         async with control_db.pool.acquire() as control_conn:
@@ -295,26 +481,15 @@ class TenantDatabaseManager:
             # Combine both sources to determine what's already applied
             all_applied = applied | tenant_applied
 
-            # Read and apply migrations
-            migrations_dir = Path(__file__).parent / "tenant_migrations"
-            if not migrations_dir.exists():
-                logger.warning(f"Tenant migrations directory not found: {migrations_dir}")
-                return
-
-            up_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith(".up.sql")])
-
             # Collect migrations to record in control DB
             new_migrations = []
 
-            for filename in up_files:
-                version = filename.replace(".up.sql", "")
+            for version, content in _TENANT_MIGRATIONS:
                 if version in all_applied:
                     logger.debug(f"Tenant {tenant_id} migration {version} already applied, skipping")
                     continue
 
                 logger.info(f"Applying tenant migration {version} to tenant {tenant_id}")
-                content = (migrations_dir / filename).read_text()
-
                 # Execute the migration in a transaction
                 async with conn.transaction():
                     await conn.execute(content)
@@ -328,33 +503,46 @@ class TenantDatabaseManager:
             # Record new migrations in control database (batch insert)
             if new_migrations:
                 async with control_db.pool.acquire() as control_conn:
-                    for version in new_migrations:
-                        await control_conn.execute(
-                            "INSERT INTO tenant_migrations (tenant_id, version) VALUES ($1, $2) ON CONFLICT DO NOTHING",
-                            tenant_id,
-                            version
-                        )
+                    await control_conn.execute(
+                        """
+                        INSERT INTO tenant_migrations (tenant_id, version)
+                        SELECT $1::uuid, unnest($2::text[])
+                        ON CONFLICT DO NOTHING
+                        """,
+                        tenant_id,
+                        new_migrations
+                    )
 
+            self._applied_migrations[tenant_id] = frozenset(all_applied.union(new_migrations))
             logger.info(f"Tenant migrations completed for tenant {tenant_id}")
 
     async def close_all_pools(self) -> None:
         """Close all cached tenant database connection pools."""
         logger.info(f"Closing {len(self._tenant_pools)} tenant database pools")
-        for tenant_id, db in self._tenant_pools.items():
-            try:
-                await db.close()
-                logger.debug(f"Closed pool for tenant {tenant_id}")
-            except Exception as e:
-                logger.error(f"Error closing pool for tenant {tenant_id}: {e}")
+        pools = list(self._tenant_pools.items())
         self._tenant_pools.clear()
+        for tenant_id, _ in pools:
+            self._notify_evicted(tenant_id)
+        # Close concurrently, along with any LRU evictions still closing
+        await asyncio.gather(
+            *(self._close_evicted(tenant_id, db) for tenant_id, db in pools),
+            *self._closing_tasks,
+            return_exceptions=True,
+        )
+        if self._admin_pool is not None:
+            await self._admin_pool.close()
+            self._admin_pool = None
+        if self._owns_control_db and self.control_db is not None:
+            await self.control_db.close()
+            self.control_db = None
+            self._owns_control_db = False
 
     async def evict_tenant_pool(self, tenant_id: str) -> None:
         """Evict a specific tenant's connection pool from cache."""
-        if tenant_id in self._tenant_pools:
-            try:
-                await self._tenant_pools[tenant_id].close()
-            except Exception as e:
-                logger.error(f"Error closing pool for tenant {tenant_id}: {e}")
-            del self._tenant_pools[tenant_id]
+        # Drop it before closing so no new request is handed the closing pool
+        db = self._tenant_pools.pop(tenant_id, None)
+        if db is not None:
+            self._notify_evicted(tenant_id)
+            self._close_in_background(tenant_id, db)
             logger.info(f"Evicted pool for tenant {tenant_id}")
 
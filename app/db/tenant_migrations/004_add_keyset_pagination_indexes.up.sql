@@ -0,0 +1,7 @@
+-- Migration: 004_add_keyset_pagination_indexes.up.sql
+-- Support keyset pagination ordered by (created_at, id), newest first
+
+CREATE INDEX IF NOT EXISTS idx_node_types_created_at_id ON node_types(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_nodes_created_at_id ON nodes(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_nodes_node_type_id_created_at_id ON nodes(node_type_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_relationships_created_at_id ON relationships(created_at DESC, id DESC);
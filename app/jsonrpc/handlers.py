@@ -2,8 +2,9 @@
 JSON-RPC handlers for all services.
 """
 
-from typing import Any, Dict, List, Optional
-from jsonrpcserver import method, Result, Success, Error
+import functools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from jsonrpcserver import method as jsonrpc_method, Result, Success, Error
 
 from app.service import (
     TenantService,
@@ -11,6 +12,56 @@ from app.service import (
 )
 from app.repository.errors import NotFoundError
 from app.api.dependencies import resolve_tenant_services
+from app.jsonrpc.openrpc import extract_method_info, get_openrpc_spec
+
+# JSON-RPC methods in definition order, read by the OpenRPC spec generator
+_RPC_METHODS: List[Callable] = []
+
+
+# Exception type -> JSON-RPC error code, checked along the exception's MRO
+_CODE_BY_ERROR = {
+    NotFoundError: -32001,
+    ValueError: -32602,
+}
+
+
+def _handle_error(err: Exception) -> Error:
+    """Convert exception to JSON-RPC error."""
+    for cls in type(err).__mro__:
+        code = _CODE_BY_ERROR.get(cls)
+        if code is not None:
+            return Error(code, str(err))
+    return Error(-32603, str(err))
+
+
+def method(func: Callable) -> Callable:
+    """Register a JSON-RPC method and record it for the OpenRPC spec."""
+    # Introspect once at import; spec generation just reads the result
+    func.__openrpc__ = extract_method_info(func)
+    _RPC_METHODS.append(func)
+
+    # Wrap results and map exceptions to JSON-RPC errors here rather than in
+    # every method
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> Result:
+        try:
+            return Success(await func(*args, **kwargs))
+        except Exception as e:
+            return _handle_error(e)
+
+    return jsonrpc_method(wrapper)
+
+
+def _paginate(pagination: Optional[Dict[str, Any]]) -> Tuple[int, str, bool]:
+    """Unpack a pagination params object into (page_size, page_token, include_total)."""
+    if not pagination:
+        return 10, "", False
+    return (
+        pagination.get("page_size", 10),
+        pagination.get("page_token", ""),
+        bool(pagination.get("include_total", False)),
+    )
+
 
 # Global service instances (to be set by register_methods)
 _tenant_service: Optional[TenantService] = None
@@ -27,76 +78,48 @@ def register_methods(
     _user_service = user_svc
 
 
-def _handle_error(err: Exception) -> Error:
-    """Convert exception to JSON-RPC error."""
-    if isinstance(err, NotFoundError):
-        return Error(-32001, str(err))
-    if isinstance(err, ValueError):
-        return Error(-32602, str(err))
-    return Error(-32603, str(err))
-
-
 # ============================================================================
 # Tenant Service Methods
 # ============================================================================
 
 @method
-async def create_tenant(slug: str, name: str) -> Result:
+async def create_tenant(slug: str, name: str) -> Dict[str, Any]:
     """Create a new tenant."""
-    try:
-        tenant = await _tenant_service.create(slug, name)
-        return Success({"tenant": tenant.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    tenant = await _tenant_service.create(slug, name)
+    return {"tenant": tenant.to_dict()}
 
 
 @method
-async def get_tenant(id: str) -> Result:
+async def get_tenant(id: str) -> Dict[str, Any]:
     """Get a tenant by ID."""
-    try:
-        tenant = await _tenant_service.get_by_id(id)
-        return Success({"tenant": tenant.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    tenant = await _tenant_service.get_by_id(id)
+    return {"tenant": tenant.to_dict()}
 
 
 @method
-async def update_tenant(id: str, slug: str = "", name: str = "", status: str = "") -> Result:
+async def update_tenant(id: str, slug: str = "", name: str = "", status: str = "") -> Dict[str, Any]:
     """Update an existing tenant."""
-    try:
-        tenant = await _tenant_service.update(id, slug, name, status)
-        return Success({"tenant": tenant.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    tenant = await _tenant_service.update(id, slug, name, status)
+    return {"tenant": tenant.to_dict()}
 
 
 @method
-async def delete_tenant(id: str) -> Result:
+async def delete_tenant(id: str) -> Dict[str, Any]:
     """Delete a tenant."""
-    try:
-        await _tenant_service.delete(id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    await _tenant_service.delete(id)
+    return {}
 
 
 @method
-async def list_tenants(pagination: Dict[str, Any] = None) -> Result:
+async def list_tenants(pagination: Dict[str, Any] = None) -> Dict[str, Any]:
     """List tenants with pagination."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        tenants, result = await _tenant_service.list(page_size, page_token)
-        return Success({
-            "tenants": [t.to_dict() for t in tenants],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, include_total = _paginate(pagination)
+    tenants, result = await _tenant_service.list(page_size, page_token, include_total)
+    # The dispatcher serializes with orjson, which handles the dataclasses natively
+    return {
+        "tenants": tenants,
+        "pagination": result,
+    }
 
 
 # ============================================================================
@@ -104,101 +127,69 @@ async def list_tenants(pagination: Dict[str, Any] = None) -> Result:
 # ============================================================================
 
 @method
-async def create_user(email: str, display_name: str) -> Result:
+async def create_user(email: str, display_name: str) -> Dict[str, Any]:
     """Create a new user."""
-    try:
-        user = await _user_service.create(email, display_name)
-        return Success({"user": user.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    user = await _user_service.create(email, display_name)
+    return {"user": user.to_dict()}
 
 
 @method
-async def get_user(id: str) -> Result:
+async def get_user(id: str) -> Dict[str, Any]:
     """Get a user by ID."""
-    try:
-        user = await _user_service.get_by_id(id)
-        return Success({"user": user.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    user = await _user_service.get_by_id(id)
+    return {"user": user.to_dict()}
 
 
 @method
-async def update_user(id: str, email: str = "", display_name: str = "") -> Result:
+async def update_user(id: str, email: str = "", display_name: str = "") -> Dict[str, Any]:
     """Update an existing user."""
-    try:
-        user = await _user_service.update(id, email, display_name)
-        return Success({"user": user.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    user = await _user_service.update(id, email, display_name)
+    return {"user": user.to_dict()}
 
 
 @method
-async def delete_user(id: str) -> Result:
+async def delete_user(id: str) -> Dict[str, Any]:
     """Delete a user."""
-    try:
-        await _user_service.delete(id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    await _user_service.delete(id)
+    return {}
 
 
 @method
-async def list_users(pagination: Dict[str, Any] = None) -> Result:
+async def list_users(pagination: Dict[str, Any] = None) -> Dict[str, Any]:
     """List users with pagination."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        users, result = await _user_service.list(page_size, page_token)
-        return Success({
-            "users": [u.to_dict() for u in users],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, include_total = _paginate(pagination)
+    users, result = await _user_service.list(page_size, page_token, include_total)
+    return {
+        "users": users,
+        "pagination": result,
+    }
 
 
 @method
-async def add_user_to_tenant(tenant_id: str, user_id: str, role: str = "") -> Result:
+async def add_user_to_tenant(tenant_id: str, user_id: str, role: str = "") -> Dict[str, Any]:
     """Add a user to a tenant."""
-    try:
-        tenant_user = await _user_service.add_to_tenant(tenant_id, user_id, role)
-        return Success({"tenant_user": tenant_user.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    tenant_user = await _user_service.add_to_tenant(tenant_id, user_id, role)
+    return {"tenant_user": tenant_user.to_dict()}
 
 
 @method
-async def remove_user_from_tenant(tenant_id: str, user_id: str) -> Result:
+async def remove_user_from_tenant(tenant_id: str, user_id: str) -> Dict[str, Any]:
     """Remove a user from a tenant."""
-    try:
-        await _user_service.remove_from_tenant(tenant_id, user_id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    await _user_service.remove_from_tenant(tenant_id, user_id)
+    return {}
 
 
 @method
-async def list_tenant_users(tenant_id: str, pagination: Dict[str, Any] = None) -> Result:
+async def list_tenant_users(tenant_id: str, pagination: Dict[str, Any] = None) -> Dict[str, Any]:
     """List users in a tenant."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        tenant_users, result = await _user_service.list_tenant_users(tenant_id, page_size, page_token)
-        return Success({
-            "tenant_users": [tu.to_dict() for tu in tenant_users],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, include_total = _paginate(pagination)
+    tenant_users, result = await _user_service.list_tenant_users(
+        tenant_id, page_size, page_token, include_total
+    )
+    return {
+        "tenant_users": tenant_users,
+        "pagination": result,
+    }
 
 
 # ============================================================================
@@ -206,67 +197,47 @@ async def list_tenant_users(tenant_id: str, pagination: Dict[str, Any] = None) -
 # ============================================================================
 
 @method
-async def create_node_type(tenant_id: str, name: str, description: str = "", schema: str = "") -> Result:
+async def create_node_type(tenant_id: str, name: str, description: str = "", schema: str = "") -> Dict[str, Any]:
     """Create a new node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_type = await services["node_type"].create(name, description, schema)
-        return Success({"node_type": node_type.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node_type = await services.node_type.create(name, description, schema)
+    return {"node_type": node_type.to_dict()}
 
 
 @method
-async def get_node_type(id: str, tenant_id: str) -> Result:
+async def get_node_type(id: str, tenant_id: str) -> Dict[str, Any]:
     """Get a node type by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_type = await services["node_type"].get_by_id(id)
-        return Success({"node_type": node_type.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node_type = await services.node_type.get_by_id(id)
+    return {"node_type": node_type.to_dict()}
 
 
 @method
-async def update_node_type(id: str, tenant_id: str, name: str = "", description: str = "", schema: str = "") -> Result:
+async def update_node_type(id: str, tenant_id: str, name: str = "", description: str = "", schema: str = "") -> Dict[str, Any]:
     """Update an existing node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node_type = await services["node_type"].update(id, name, description, schema)
-        return Success({"node_type": node_type.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node_type = await services.node_type.update(id, name, description, schema)
+    return {"node_type": node_type.to_dict()}
 
 
 @method
-async def delete_node_type(id: str, tenant_id: str) -> Result:
+async def delete_node_type(id: str, tenant_id: str) -> Dict[str, Any]:
     """Delete a node type."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["node_type"].delete(id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    await services.node_type.delete(id)
+    return {}
 
 
 @method
-async def list_node_types(tenant_id: str, pagination: Dict[str, Any] = None) -> Result:
+async def list_node_types(tenant_id: str, pagination: Dict[str, Any] = None) -> Dict[str, Any]:
     """List node types for a tenant."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        services = await resolve_tenant_services(tenant_id)
-        node_types, result = await services["node_type"].list(page_size, page_token)
-        return Success({
-            "node_types": [nt.to_dict() for nt in node_types],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, _ = _paginate(pagination)
+    services = await resolve_tenant_services(tenant_id)
+    node_types, result = await services.node_type.list(page_size, page_token)
+    return {
+        "node_types": node_types,
+        "pagination": result,
+    }
 
 
 # ============================================================================
@@ -274,67 +245,47 @@ async def list_node_types(tenant_id: str, pagination: Dict[str, Any] = None) ->
 # ============================================================================
 
 @method
-async def create_node(tenant_id: str, node_type_id: str, data: str = "{}") -> Result:
+async def create_node(tenant_id: str, node_type_id: str, data: str = "{}") -> Dict[str, Any]:
     """Create a new node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node = await services["node"].create(node_type_id, data)
-        return Success({"node": node.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node = await services.node.create(node_type_id, data)
+    return {"node": node.to_dict()}
 
 
 @method
-async def get_node(id: str, tenant_id: str) -> Result:
+async def get_node(id: str, tenant_id: str) -> Dict[str, Any]:
     """Get a node by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node = await services["node"].get_by_id(id)
-        return Success({"node": node.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node = await services.node.get_by_id(id)
+    return {"node": node.to_dict()}
 
 
 @method
-async def update_node(id: str, tenant_id: str, data: str = "") -> Result:
+async def update_node(id: str, tenant_id: str, data: str = "") -> Dict[str, Any]:
     """Update an existing node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        node = await services["node"].update(id, data)
-        return Success({"node": node.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    node = await services.node.update(id, data)
+    return {"node": node.to_dict()}
 
 
 @method
-async def delete_node(id: str, tenant_id: str) -> Result:
+async def delete_node(id: str, tenant_id: str) -> Dict[str, Any]:
     """Delete a node."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["node"].delete(id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    await services.node.delete(id)
+    return {}
 
 
 @method
-async def list_nodes(tenant_id: str, node_type_id: str = "", pagination: Dict[str, Any] = None) -> Result:
+async def list_nodes(tenant_id: str, node_type_id: str = "", pagination: Dict[str, Any] = None) -> Dict[str, Any]:
     """List nodes for a tenant with optional filtering."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        services = await resolve_tenant_services(tenant_id)
-        nodes, result = await services["node"].list(node_type_id or None, page_size, page_token)
-        return Success({
-            "nodes": [n.to_dict() for n in nodes],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, _ = _paginate(pagination)
+    services = await resolve_tenant_services(tenant_id)
+    nodes, result = await services.node.list(node_type_id or None, page_size, page_token)
+    return {
+        "nodes": nodes,
+        "pagination": result,
+    }
 
 
 # ============================================================================
@@ -348,47 +299,35 @@ async def create_relationship(
     target_node_id: str,
     relationship_type: str,
     data: str = "{}"
-) -> Result:
+) -> Dict[str, Any]:
     """Create a new relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rel = await services["relationship"].create(source_node_id, target_node_id, relationship_type, data)
-        return Success({"relationship": rel.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    rel = await services.relationship.create(source_node_id, target_node_id, relationship_type, data)
+    return {"relationship": rel.to_dict()}
 
 
 @method
-async def get_relationship(id: str, tenant_id: str) -> Result:
+async def get_relationship(id: str, tenant_id: str) -> Dict[str, Any]:
     """Get a relationship by ID."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rel = await services["relationship"].get_by_id(id)
-        return Success({"relationship": rel.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    rel = await services.relationship.get_by_id(id)
+    return {"relationship": rel.to_dict()}
 
 
 @method
-async def update_relationship(id: str, tenant_id: str, relationship_type: str = "", data: str = "") -> Result:
+async def update_relationship(id: str, tenant_id: str, relationship_type: str = "", data: str = "") -> Dict[str, Any]:
     """Update an existing relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        rel = await services["relationship"].update(id, relationship_type, data)
-        return Success({"relationship": rel.to_dict()})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    rel = await services.relationship.update(id, relationship_type, data)
+    return {"relationship": rel.to_dict()}
 
 
 @method
-async def delete_relationship(id: str, tenant_id: str) -> Result:
+async def delete_relationship(id: str, tenant_id: str) -> Dict[str, Any]:
     """Delete a relationship."""
-    try:
-        services = await resolve_tenant_services(tenant_id)
-        await services["relationship"].delete(id)
-        return Success({})
-    except Exception as e:
-        return _handle_error(e)
+    services = await resolve_tenant_services(tenant_id)
+    await services.relationship.delete(id)
+    return {}
 
 
 @method
@@ -398,29 +337,21 @@ async def list_relationships(
     target_node_id: str = "",
     relationship_type: str = "",
     pagination: Dict[str, Any] = None
-) -> Result:
+) -> Dict[str, Any]:
     """List relationships for a tenant with optional filtering."""
-    try:
-        page_size = 10
-        page_token = ""
-        if pagination:
-            page_size = pagination.get("page_size", 10)
-            page_token = pagination.get("page_token", "")
-        
-        services = await resolve_tenant_services(tenant_id)
-        rels, result = await services["relationship"].list(
-            source_node_id or None,
-            target_node_id or None,
-            relationship_type or None,
-            page_size,
-            page_token
-        )
-        return Success({
-            "relationships": [r.to_dict() for r in rels],
-            "pagination": result.to_dict(),
-        })
-    except Exception as e:
-        return _handle_error(e)
+    page_size, page_token, _ = _paginate(pagination)
+    services = await resolve_tenant_services(tenant_id)
+    rels, result = await services.relationship.list(
+        source_node_id or None,
+        target_node_id or None,
+        relationship_type or None,
+        page_size,
+        page_token
+    )
+    return {
+        "relationships": rels,
+        "pagination": result,
+    }
 
 
 # ============================================================================
@@ -428,7 +359,7 @@ async def list_relationships(
 # ============================================================================
 
 @method
-async def rpc_discover() -> Result:
+async def rpc_discover() -> Dict[str, Any]:
     """
     Discover available JSON-RPC methods and their schemas.
     
@@ -442,9 +373,4 @@ async def rpc_discover() -> Result:
     Note: This method is registered as "rpc_discover" but the OpenRPC spec
     shows it as "rpc.discover" (with dot) for standards compliance.
     """
-    try:
-        from app.jsonrpc.openrpc import generate_openrpc_spec
-        spec = generate_openrpc_spec()
-        return Success({"openrpc": spec})
-    except Exception as e:
-        return _handle_error(e)
+    return {"openrpc": get_openrpc_spec()}
@@ -5,66 +5,88 @@ Auto-generates OpenRPC spec from registered JSON-RPC methods using introspection
 """
 
 import inspect
-import json
-from typing import Any, Dict, List, Optional
+import types
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union, get_args, get_origin, get_type_hints
+
+import orjson
 
 # OpenRPC spec metadata
 OPENRPC_VERSION = "1.2.6"
 SERVICE_NAME = "flex-db"
 SERVICE_VERSION = "1.0.0"
 
+# The handlers module doesn't change at runtime, so the spec is built once
+_SPEC: Optional[Dict[str, Any]] = None
+_SPEC_JSON_BYTES: Optional[bytes] = None
+
+
+# Python type -> JSON Schema type
+_TYPE_MAPPING: Dict[Any, Dict[str, Any]] = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    dict: {"type": "object"},
+    list: {"type": "array"},
+}
+_UNION_ORIGINS = (Union, types.UnionType)
+
+# Schemas for params whose dict annotation doesn't describe their fields
+_PARAM_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "pagination": {
+        "type": "object",
+        "properties": {
+            "page_size": {"type": "integer", "default": 10, "description": "Items per page"},
+            "page_token": {
+                "type": "string",
+                "default": "",
+                "description": "next_page_token from the previous page",
+            },
+            "include_total": {
+                "type": "boolean",
+                "default": False,
+                "description": (
+                    "Also count all matching items (slower). Tenant, user and tenant "
+                    "user lists return pagination.total_count as null unless this is "
+                    "set; the other lists always count."
+                ),
+            },
+        },
+    },
+}
+# Container origins whose schema never carries a default
+_CONTAINER_ORIGINS = (dict, list)
+
+
+@lru_cache(maxsize=None)
+def _base_type_schema(param_type: Any) -> Dict[str, Any]:
+    """Resolve a type to its JSON Schema without a default. Shared; don't mutate."""
+    origin = get_origin(param_type)
+
+    # Handle Optional[X] or Union[X, None]
+    if origin in _UNION_ORIGINS:
+        non_none_args = [arg for arg in get_args(param_type) if arg is not type(None)]
+        if non_none_args:
+            return _base_type_schema(non_none_args[0])
+
+    # Handle Dict[str, Any] or Dict[str, Any] = None
+    if origin is dict:
+        return {"type": "object", "additionalProperties": True}
+
+    # Handle List types
+    if origin is list:
+        return {"type": "array", "items": {"type": "object"}}
+
+    # Default to string if unknown
+    return _TYPE_MAPPING.get(param_type, _TYPE_MAPPING[str])
+
 
 def get_type_schema(param_type: type, default_value: Any = None) -> Dict[str, Any]:
     """Convert Python type to JSON Schema type."""
-    type_mapping = {
-        str: {"type": "string"},
-        int: {"type": "integer"},
-        float: {"type": "number"},
-        bool: {"type": "boolean"},
-        dict: {"type": "object"},
-        list: {"type": "array"},
-    }
-    
-    # Handle Optional types (Union[X, None])
-    if hasattr(param_type, '__origin__'):
-        origin = param_type.__origin__
-        
-        # Handle Optional[X] or Union[X, None]
-        if origin is type(None) or (hasattr(origin, '__name__') and origin.__name__ == 'Union'):
-            args = getattr(param_type, '__args__', [])
-            # Filter out None type
-            non_none_args = [arg for arg in args if arg is not type(None)]
-            if non_none_args:
-                schema = get_type_schema(non_none_args[0], default_value)
-                if default_value is not None:
-                    schema["default"] = default_value
-                elif default_value == "":
-                    schema["default"] = ""
-                return schema
-        
-        # Handle Dict[str, Any] or Dict[str, Any] = None
-        if origin is dict:
-            return {"type": "object", "additionalProperties": True}
-        
-        # Handle List types
-        if origin is list:
-            return {"type": "array", "items": {"type": "object"}}
-    
-    # Direct type mapping
-    if param_type in type_mapping:
-        schema = type_mapping[param_type].copy()
-        if default_value is not None:
-            schema["default"] = default_value
-        elif default_value == "":
-            schema["default"] = ""
-        return schema
-    
-    # Default to string if unknown
-    schema = {"type": "string"}
-    if default_value is not None:
+    schema = dict(_base_type_schema(param_type))
+    if default_value is not None and get_origin(param_type) not in _CONTAINER_ORIGINS:
         schema["default"] = default_value
-    elif default_value == "":
-        schema["default"] = ""
     return schema
 
 
@@ -72,6 +94,8 @@ def extract_method_info(func) -> Optional[Dict[str, Any]]:
     """Extract method information from a function for OpenRPC spec."""
     try:
         sig = inspect.signature(func)
+        # Resolves string/forward-reference annotations as well
+        hints = get_type_hints(func)
         doc = inspect.getdoc(func) or ""
         
         params = []
@@ -93,10 +117,10 @@ def extract_method_info(func) -> Optional[Dict[str, Any]]:
             if param_name == 'self':
                 continue
             
-            param_type = param.annotation if param.annotation != inspect.Parameter.empty else str
+            param_type = hints.get(param_name, str)
             default_value = param.default if param.default != inspect.Parameter.empty else None
             
-            param_schema = get_type_schema(param_type, default_value)
+            param_schema = _PARAM_SCHEMAS.get(param_name) or get_type_schema(param_type, default_value)
             
             param_info = {
                 "name": param_name,
@@ -110,10 +134,8 @@ def extract_method_info(func) -> Optional[Dict[str, Any]]:
             elif default_value == "":
                 param_info["description"] = "Optional. Default: empty string"
             
-            if default_value is not None:
-                param_info["required"] = False
-            else:
-                param_info["required"] = True
+            # A None default still makes the param optional
+            param_info["required"] = param.default is inspect.Parameter.empty
             
             params.append(param_info)
         
@@ -144,15 +166,9 @@ def generate_openrpc_spec() -> Dict[str, Any]:
     # Import handlers module to inspect methods
     from app.jsonrpc import handlers
     
-    # Get all async functions from handlers module
-    # These are our JSON-RPC methods decorated with @method
-    for name, obj in inspect.getmembers(handlers, inspect.iscoroutinefunction):
-        # Skip private methods and helper functions
-        if name.startswith('_') or name == 'register_methods':
-            continue
-        
-        # Extract method information
-        method_info = extract_method_info(obj)
+    # Method info is extracted when @method decorates each handler
+    for obj in handlers._RPC_METHODS:
+        method_info = obj.__openrpc__
         if method_info:
             # Check if method has a custom name (for rpc.discover)
             method_name = method_info["name"]
@@ -281,7 +297,17 @@ def generate_openrpc_spec() -> Dict[str, Any]:
     return spec
 
 
-def get_openrpc_spec_json() -> str:
-    """Get OpenRPC spec as JSON string."""
-    spec = generate_openrpc_spec()
-    return json.dumps(spec, indent=2)
+def get_openrpc_spec() -> Dict[str, Any]:
+    """Get the OpenRPC spec, generating it on first use."""
+    global _SPEC
+    if _SPEC is None:
+        _SPEC = generate_openrpc_spec()
+    return _SPEC
+
+
+def get_openrpc_spec_json() -> bytes:
+    """Get OpenRPC spec as UTF-8 encoded JSON, serialized on first use."""
+    global _SPEC_JSON_BYTES
+    if _SPEC_JSON_BYTES is None:
+        _SPEC_JSON_BYTES = orjson.dumps(get_openrpc_spec(), option=orjson.OPT_INDENT_2)
+    return _SPEC_JSON_BYTES
@@ -4,6 +4,8 @@ JSON-RPC server implementation using FastAPI.
 
 import json
 import logging
+
+import orjson
 from fastapi import APIRouter, Request, Response, status
 from jsonrpcserver import async_dispatch
 
@@ -16,9 +18,9 @@ router = APIRouter()
 async def handle_jsonrpc(request: Request) -> Response:
     """Handle JSON-RPC requests."""
     try:
+        # orjson parses the raw bytes directly, so the body is never decoded to str
         body = await request.body()
-        body_str = body.decode('utf-8')
-        response = await async_dispatch(body_str)
+        response = await async_dispatch(body, deserializer=orjson.loads, serializer=orjson.dumps)
         
         if response is None:
             # Notification (no response needed)
@@ -35,7 +37,7 @@ async def handle_jsonrpc(request: Request) -> Response:
             "id": None,
         }
         return Response(
-            content=json.dumps(error_response),
+            content=orjson.dumps(error_response),
             media_type="application/json",
             status_code=status.HTTP_400_BAD_REQUEST,
         )
@@ -47,7 +49,7 @@ async def handle_jsonrpc(request: Request) -> Response:
             "id": None,
         }
         return Response(
-            content=json.dumps(error_response),
+            content=orjson.dumps(error_response),
             media_type="application/json",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
@@ -79,7 +81,7 @@ async def get_openrpc_spec() -> Response:
             "message": str(e)
         }
         return Response(
-            content=json.dumps(error_response),
+            content=orjson.dumps(error_response),
             media_type="application/json",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
@@ -0,0 +1,80 @@
+"""
+In-process entity cache for repository lookups by id.
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class EntityCache(Generic[T]):
+    """
+    Bounded LRU cache with a time-to-live per entry.
+
+    The cache is per process, so a write made through another process is
+    only seen here once the entry expires. Entities are copied on the way in
+    and out so callers can't mutate the cached instance.
+    """
+
+    __slots__ = ("_entries", "_max_size", "_ttl", "_generations", "_epoch")
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        # id -> (expires_at, entity), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        # id -> number of writes seen for it, so a lookup that raced a write
+        # can tell its row is stale. Reset (bumping the epoch) when it grows
+        # past max_size, which makes every in-flight lookup look stale.
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, id: str) -> Optional[T]:
+        """Return a copy of the cached entity, or None if absent or expired."""
+        entry = self._entries.get(id)
+        if entry is None:
+            return None
+        expires_at, entity = entry
+        if expires_at <= time.monotonic():
+            del self._entries[id]
+            return None
+        self._entries.move_to_end(id)
+        return copy.copy(entity)
+
+    def generation(self, id: str) -> Tuple[int, int]:
+        """Return a token that changes whenever id is written or invalidated."""
+        return self._epoch, self._generations.get(id, 0)
+
+    def put_if_unchanged(self, id: str, entity: T, generation: Tuple[int, int]) -> None:
+        """Cache an entity loaded by a lookup, unless id was written since generation."""
+        if self.generation(id) == generation:
+            self._store(id, entity)
+
+    def put(self, id: str, entity: T) -> None:
+        """Cache an entity written through the repository."""
+        self._bump(id)
+        self._store(id, entity)
+
+    def invalidate(self, id: str) -> None:
+        """Drop an entity from the cache."""
+        self._bump(id)
+        self._entries.pop(id, None)
+
+    def _bump(self, id: str) -> None:
+        """Record a write to id, invalidating lookups that started before it."""
+        if id not in self._generations and len(self._generations) >= max(self._max_size, 1):
+            self._generations.clear()
+            self._epoch += 1
+        self._generations[id] = self._generations.get(id, 0) + 1
+
+    def _store(self, id: str, entity: T) -> None:
+        """Insert an entity, evicting the least recently used one if full."""
+        if self._max_size <= 0 or self._ttl <= 0:
+            return
+        self._entries[id] = (time.monotonic() + self._ttl, copy.copy(entity))
+        self._entries.move_to_end(id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Tenant:
     """Tenant entity."""
     id: str = ""
@@ -29,7 +29,7 @@ class Tenant:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """User entity."""
     id: str = ""
@@ -49,7 +49,7 @@ class User:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TenantUser:
     """User's membership in a tenant."""
     tenant_id: str = ""
@@ -67,7 +67,7 @@ class TenantUser:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeType:
     """Node type entity."""
     id: str = ""
@@ -91,7 +91,7 @@ class NodeType:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """Node entity."""
     id: str = ""
@@ -113,7 +113,7 @@ class Node:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     """Relationship between nodes."""
     id: str = ""
@@ -139,18 +139,22 @@ class Relationship:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListOptions:
     """Common pagination options."""
     page_size: int = 10
     page_token: str = ""
+    # Counting every matching row is a full scan, so tenant and user listings
+    # only count when asked to
+    include_total: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListResult:
     """Common pagination result metadata."""
     next_page_token: str = ""
-    total_count: int = 0
+    # None when the total wasn't computed (see ListOptions.include_total)
+    total_count: Optional[int] = None
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -2,7 +2,6 @@
 Node repository implementation.
 """
 
-import json
 import uuid
 from datetime import datetime
 from typing import List, Optional, Tuple
@@ -11,7 +10,13 @@ import asyncpg
 
 from app.db.database import Database
 from app.repository.models import Node, ListOptions, ListResult
+from app.repository.pagination import (
+    decode_created_at_token,
+    encode_created_at_token,
+    total_from_page,
+)
 from app.repository.errors import NotFoundError
+from app.repository.singleflight import SingleFlight
 
 
 class NodeRepository:
@@ -19,12 +24,14 @@ class NodeRepository:
 
     def __init__(self, db: Database):
         self.db = db
+        # Concurrent lookups for the same id share one query
+        self._lookups: SingleFlight[Node] = SingleFlight()
 
     async def create(self, node: Node) -> Node:
         """Create a new node."""
         node.id = str(uuid.uuid4())
-        node.created_at = datetime.now()
-        node.updated_at = datetime.now()
+        # One timestamp so created_at and updated_at match exactly
+        node.created_at = node.updated_at = datetime.now()
 
         if not node.data:
             node.data = "{}"
@@ -46,6 +53,10 @@ class NodeRepository:
 
     async def get_by_id(self, id: str) -> Node:
         """Retrieve a node by ID."""
+        return await self._lookups.do(id, lambda: self._fetch_by_id(id))
+
+    async def _fetch_by_id(self, id: str) -> Node:
+        """Load a node from the database."""
         query = """
             SELECT id, node_type_id, data::text, created_at, updated_at 
             FROM nodes 
@@ -80,11 +91,32 @@ class NodeRepository:
                 node.id, node.data, node.updated_at
             )
 
+        self._lookups.forget(node.id)
+
         if not row:
             raise NotFoundError(f"node not found: {node.id}")
 
         return self._row_to_node(row)
 
+    async def update_partial(self, id: str, data: Optional[str] = None) -> Node:
+        """Update only the given fields of a node in a single statement."""
+        query = """
+            UPDATE nodes
+            SET data = COALESCE($2::jsonb, data), updated_at = NOW()
+            WHERE id = $1
+            RETURNING id, node_type_id, data::text, created_at, updated_at
+        """
+
+        async with self.db.pool.acquire() as conn:
+            row = await conn.fetchrow(query, id, data)
+
+        self._lookups.forget(id)
+
+        if not row:
+            raise NotFoundError(f"node not found: {id}")
+
+        return self._row_to_node(row)
+
     async def delete(self, id: str) -> None:
         """Delete a node by ID."""
         query = "DELETE FROM nodes WHERE id = $1"
@@ -92,61 +124,88 @@ class NodeRepository:
         async with self.db.pool.acquire() as conn:
             result = await conn.execute(query, id)
 
+        self._lookups.forget(id)
+
         if result == "DELETE 0":
             raise NotFoundError(f"node not found: {id}")
 
     async def list(self, node_type_id: Optional[str], opts: ListOptions) -> Tuple[List[Node], ListResult]:
-        """Retrieve nodes with pagination and optional filtering."""
+        """Retrieve nodes with keyset pagination and optional filtering, newest first."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
+        cursor = decode_created_at_token(opts.page_token)
 
-        async with self.db.pool.acquire() as conn:
-            # Build count query
-            if node_type_id:
-                total_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM nodes WHERE node_type_id = $1",
-                    node_type_id
-                )
+        # Fetch one extra row to learn whether another page follows
+        if node_type_id:
+            if cursor is None:
                 query = """
                     SELECT id, node_type_id, data::text, created_at, updated_at 
                     FROM nodes 
                     WHERE node_type_id = $1
-                    ORDER BY created_at DESC 
-                    LIMIT $2 OFFSET $3
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT $2
                 """
-                rows = await conn.fetch(query, node_type_id, page_size, offset)
+                args = (node_type_id, page_size + 1)
             else:
-                total_count = await conn.fetchval(
-                    "SELECT COUNT(*) FROM nodes"
-                )
                 query = """
                     SELECT id, node_type_id, data::text, created_at, updated_at 
                     FROM nodes 
-                    ORDER BY created_at DESC 
-                    LIMIT $1 OFFSET $2
+                    WHERE node_type_id = $1 AND (created_at, id) < ($3, $4)
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT $2
                 """
-                rows = await conn.fetch(query, page_size, offset)
-
-        nodes = [self._row_to_node(row) for row in rows]
-
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(nodes)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
+                args = (node_type_id, page_size + 1, *cursor)
+        else:
+            if cursor is None:
+                query = """
+                    SELECT id, node_type_id, data::text, created_at, updated_at 
+                    FROM nodes 
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT $1
+                """
+                args = (page_size + 1,)
+            else:
+                query = """
+                    SELECT id, node_type_id, data::text, created_at, updated_at 
+                    FROM nodes 
+                    WHERE (created_at, id) < ($2, $3)
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT $1
+                """
+                args = (page_size + 1, *cursor)
 
-        return nodes, result
+        async with self.db.pool.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+
+            # A first page with no page after it holds every row
+            total_count = None
+            if cursor is None:
+                total_count = total_from_page(0, page_size + 1, len(rows))
+            if total_count is None:
+                if node_type_id:
+                    total_count = await conn.fetchval(
+                        "SELECT COUNT(*) FROM nodes WHERE node_type_id = $1",
+                        node_type_id
+                    )
+                else:
+                    total_count = await conn.fetchval(
+                        "SELECT COUNT(*) FROM nodes"
+                    )
+
+        nodes = [self._row_to_node(row) for row in rows[:page_size]]
+
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = nodes[-1]
+            next_page_token = encode_created_at_token(last.created_at, last.id)
+
+        return nodes, ListResult(next_page_token, total_count)
 
     def _row_to_node(self, row: asyncpg.Record) -> Node:
         """Convert a database row to a Node object."""
         return Node(
-            id=str(row[0]),
+            id=row[0],
             tenant_id="",  # Not stored in tenant database (each tenant has own DB)
-            node_type_id=str(row[1]),
+            node_type_id=row[1],
             data=row[2] or "{}",
             created_at=row[3],
             updated_at=row[4],
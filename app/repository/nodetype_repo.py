@@ -4,13 +4,19 @@ NodeType repository implementation.
 
 import uuid
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import asyncpg
 
 from app.db.database import Database
 from app.repository.models import NodeType, ListOptions, ListResult
+from app.repository.pagination import (
+    decode_created_at_token,
+    encode_created_at_token,
+    total_from_page,
+)
 from app.repository.errors import NotFoundError
+from app.repository.singleflight import SingleFlight
 
 
 class NodeTypeRepository:
@@ -18,12 +24,14 @@ class NodeTypeRepository:
 
     def __init__(self, db: Database):
         self.db = db
+        # Concurrent lookups for the same id share one query
+        self._lookups: SingleFlight[NodeType] = SingleFlight()
 
     async def create(self, node_type: NodeType) -> NodeType:
         """Create a new node type."""
         node_type.id = str(uuid.uuid4())
-        node_type.created_at = datetime.now()
-        node_type.updated_at = datetime.now()
+        # One timestamp so created_at and updated_at match exactly
+        node_type.created_at = node_type.updated_at = datetime.now()
 
         # Parse schema to JSON or None - preserve empty/falsy JSON schemas like '{}' or '[]'
         schema_value = None
@@ -48,6 +56,10 @@ class NodeTypeRepository:
 
     async def get_by_id(self, id: str) -> NodeType:
         """Retrieve a node type by ID."""
+        return await self._lookups.do(id, lambda: self._fetch_by_id(id))
+
+    async def _fetch_by_id(self, id: str) -> NodeType:
+        """Load a node type from the database."""
         query = """
             SELECT id, name, description, COALESCE(schema::text, ''), created_at, updated_at 
             FROM node_types 
@@ -86,11 +98,41 @@ class NodeTypeRepository:
                 node_type.updated_at
             )
 
+        self._lookups.forget(node_type.id)
+
         if not row:
             raise NotFoundError(f"node_type not found: {node_type.id}")
 
         return self._row_to_node_type(row)
 
+    async def update_partial(
+        self,
+        id: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        schema: Optional[str] = None,
+    ) -> NodeType:
+        """Update only the given fields of a node type in a single statement."""
+        query = """
+            UPDATE node_types
+            SET name = COALESCE($2, name),
+                description = COALESCE($3, description),
+                schema = COALESCE($4::jsonb, schema),
+                updated_at = NOW()
+            WHERE id = $1
+            RETURNING id, name, description, COALESCE(schema::text, ''), created_at, updated_at
+        """
+
+        async with self.db.pool.acquire() as conn:
+            row = await conn.fetchrow(query, id, name, description, schema)
+
+        self._lookups.forget(id)
+
+        if not row:
+            raise NotFoundError(f"node_type not found: {id}")
+
+        return self._row_to_node_type(row)
+
     async def delete(self, id: str) -> None:
         """Delete a node type by ID."""
         query = "DELETE FROM node_types WHERE id = $1"
@@ -98,45 +140,60 @@ class NodeTypeRepository:
         async with self.db.pool.acquire() as conn:
             result = await conn.execute(query, id)
 
+        self._lookups.forget(id)
+
         if result == "DELETE 0":
             raise NotFoundError(f"node_type not found: {id}")
 
     async def list(self, opts: ListOptions) -> Tuple[List[NodeType], ListResult]:
-        """Retrieve node types with pagination."""
+        """Retrieve node types with keyset pagination, newest first."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
-
-        async with self.db.pool.acquire() as conn:
-            total_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM node_types"
-            )
+        cursor = decode_created_at_token(opts.page_token)
 
+        # Fetch one extra row to learn whether another page follows
+        if cursor is None:
             query = """
                 SELECT id, name, description, COALESCE(schema::text, ''), created_at, updated_at 
                 FROM node_types 
-                ORDER BY created_at DESC 
-                LIMIT $1 OFFSET $2
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
             """
-            rows = await conn.fetch(query, page_size, offset)
+            args = (page_size + 1,)
+        else:
+            query = """
+                SELECT id, name, description, COALESCE(schema::text, ''), created_at, updated_at 
+                FROM node_types 
+                WHERE (created_at, id) < ($2, $3)
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
+            """
+            args = (page_size + 1, *cursor)
+
+        async with self.db.pool.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+
+            # A first page with no page after it holds every row
+            total_count = None
+            if cursor is None:
+                total_count = total_from_page(0, page_size + 1, len(rows))
+            if total_count is None:
+                total_count = await conn.fetchval(
+                    "SELECT COUNT(*) FROM node_types"
+                )
 
-        node_types = [self._row_to_node_type(row) for row in rows]
+        node_types = [self._row_to_node_type(row) for row in rows[:page_size]]
 
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(node_types)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = node_types[-1]
+            next_page_token = encode_created_at_token(last.created_at, last.id)
 
-        return node_types, result
+        return node_types, ListResult(next_page_token, total_count)
 
     def _row_to_node_type(self, row: asyncpg.Record) -> NodeType:
         """Convert a database row to a NodeType object."""
         return NodeType(
-            id=str(row[0]),
+            id=row[0],
             tenant_id="",  # Not stored in tenant database (each tenant has own DB)
             name=row[1],
             description=row[2] or "",
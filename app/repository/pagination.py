@@ -0,0 +1,85 @@
+"""
+Pagination helpers.
+
+Keyset page tokens are opaque URL-safe base64 strings wrapping the sort key
+of the last row on the previous page, so the next page is an index seek
+instead of an OFFSET scan.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+_SEPARATOR = "|"
+
+
+def encode_page_token(*parts: str) -> str:
+    """Encode sort key values into an opaque page token."""
+    raw = _SEPARATOR.join(parts).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_page_token(token: str, num_parts: int) -> Optional[Tuple[str, ...]]:
+    """
+    Decode a page token into its sort key values.
+
+    Returns None for an empty or malformed token, which callers treat as a
+    request for the first page.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8")
+    except ValueError:
+        # binascii.Error and the Unicode errors are all ValueErrors
+        return None
+    parts = tuple(raw.split(_SEPARATOR))
+    if len(parts) != num_parts:
+        return None
+    return parts
+
+
+def total_from_page(offset: int, page_size: int, row_count: int) -> Optional[int]:
+    """
+    Return the total row count implied by a fetched page, or None if unknown.
+    
+    A page shorter than page_size is the last one, so the total is the rows
+    skipped plus the rows returned. An empty page only proves that at offset
+    0; past the end, the offset may overshoot and a COUNT is still needed.
+    """
+    if row_count < page_size and (row_count or offset == 0):
+        return offset + row_count
+    return None
+
+
+def encode_created_at_token(created_at: datetime, id: str) -> str:
+    """Encode a (created_at, id) keyset cursor."""
+    return encode_page_token(created_at.isoformat(), id)
+
+
+def decode_created_at_token(token: str) -> Optional[Tuple[datetime, str]]:
+    """Decode a (created_at, id) keyset cursor, or None if absent or malformed."""
+    parts = decode_page_token(token, 2)
+    if parts is None:
+        return None
+    try:
+        return datetime.fromisoformat(parts[0]), str(uuid.UUID(parts[1]))
+    except ValueError:
+        return None
+
+
+def encode_id_token(id: str) -> str:
+    """Encode a single-id keyset cursor."""
+    return encode_page_token(id)
+
+
+def decode_id_token(token: str) -> Optional[str]:
+    """Decode a single-id keyset cursor, or None if absent or malformed."""
+    parts = decode_page_token(token, 1)
+    if parts is None:
+        return None
+    try:
+        return str(uuid.UUID(parts[0]))
+    except ValueError:
+        return None
@@ -10,7 +10,13 @@ import asyncpg
 
 from app.db.database import Database
 from app.repository.models import Relationship, ListOptions, ListResult
+from app.repository.pagination import (
+    decode_created_at_token,
+    encode_created_at_token,
+    total_from_page,
+)
 from app.repository.errors import NotFoundError
+from app.repository.singleflight import SingleFlight
 
 
 class RelationshipRepository:
@@ -18,12 +24,14 @@ class RelationshipRepository:
 
     def __init__(self, db: Database):
         self.db = db
+        # Concurrent lookups for the same id share one query
+        self._lookups: SingleFlight[Relationship] = SingleFlight()
 
     async def create(self, rel: Relationship) -> Relationship:
         """Create a new relationship."""
         rel.id = str(uuid.uuid4())
-        rel.created_at = datetime.now()
-        rel.updated_at = datetime.now()
+        # One timestamp so created_at and updated_at match exactly
+        rel.created_at = rel.updated_at = datetime.now()
 
         if not rel.data:
             rel.data = "{}"
@@ -45,6 +53,10 @@ class RelationshipRepository:
 
     async def get_by_id(self, id: str) -> Relationship:
         """Retrieve a relationship by ID."""
+        return await self._lookups.do(id, lambda: self._fetch_by_id(id))
+
+    async def _fetch_by_id(self, id: str) -> Relationship:
+        """Load a relationship from the database."""
         query = """
             SELECT id, source_node_id, target_node_id, relationship_type, data::text, created_at, updated_at 
             FROM relationships 
@@ -79,11 +91,39 @@ class RelationshipRepository:
                 rel.id, rel.relationship_type, rel.data, rel.updated_at
             )
 
+        self._lookups.forget(rel.id)
+
         if not row:
             raise NotFoundError(f"relationship not found: {rel.id}")
 
         return self._row_to_relationship(row)
 
+    async def update_partial(
+        self,
+        id: str,
+        relationship_type: Optional[str] = None,
+        data: Optional[str] = None,
+    ) -> Relationship:
+        """Update only the given fields of a relationship in a single statement."""
+        query = """
+            UPDATE relationships
+            SET relationship_type = COALESCE($2, relationship_type),
+                data = COALESCE($3::jsonb, data),
+                updated_at = NOW()
+            WHERE id = $1
+            RETURNING id, source_node_id, target_node_id, relationship_type, data::text, created_at, updated_at
+        """
+
+        async with self.db.pool.acquire() as conn:
+            row = await conn.fetchrow(query, id, relationship_type, data)
+
+        self._lookups.forget(id)
+
+        if not row:
+            raise NotFoundError(f"relationship not found: {id}")
+
+        return self._row_to_relationship(row)
+
     async def delete(self, id: str) -> None:
         """Delete a relationship by ID."""
         query = "DELETE FROM relationships WHERE id = $1"
@@ -91,6 +131,8 @@ class RelationshipRepository:
         async with self.db.pool.acquire() as conn:
             result = await conn.execute(query, id)
 
+        self._lookups.forget(id)
+
         if result == "DELETE 0":
             raise NotFoundError(f"relationship not found: {id}")
 
@@ -101,14 +143,9 @@ class RelationshipRepository:
         rel_type: Optional[str],
         opts: ListOptions
     ) -> Tuple[List[Relationship], ListResult]:
-        """Retrieve relationships with pagination and optional filtering."""
+        """Retrieve relationships with keyset pagination and optional filtering, newest first."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
+        cursor = decode_created_at_token(opts.page_token)
 
         # Build dynamic query with filters
         count_query = "SELECT COUNT(*) FROM relationships WHERE 1=1"
@@ -138,29 +175,42 @@ class RelationshipRepository:
             args.append(rel_type)
             arg_idx += 1
 
-        list_query += f" ORDER BY created_at DESC LIMIT ${arg_idx} OFFSET ${arg_idx + 1}"
-        list_args = args + [page_size, offset]
+        list_args = list(args)
+        if cursor is not None:
+            list_query += f" AND (created_at, id) < (${arg_idx}, ${arg_idx + 1})"
+            list_args.extend(cursor)
+            arg_idx += 2
+
+        # Fetch one extra row to learn whether another page follows
+        list_query += f" ORDER BY created_at DESC, id DESC LIMIT ${arg_idx}"
+        list_args.append(page_size + 1)
 
         async with self.db.pool.acquire() as conn:
-            total_count = await conn.fetchval(count_query, *args)
             rows = await conn.fetch(list_query, *list_args)
 
-        relationships = [self._row_to_relationship(row) for row in rows]
+            # A first page with no page after it holds every row
+            total_count = None
+            if cursor is None:
+                total_count = total_from_page(0, page_size + 1, len(rows))
+            if total_count is None:
+                total_count = await conn.fetchval(count_query, *args)
+
+        relationships = [self._row_to_relationship(row) for row in rows[:page_size]]
 
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(relationships)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = relationships[-1]
+            next_page_token = encode_created_at_token(last.created_at, last.id)
 
-        return relationships, result
+        return relationships, ListResult(next_page_token, total_count)
 
     def _row_to_relationship(self, row: asyncpg.Record) -> Relationship:
         """Convert a database row to a Relationship object."""
         return Relationship(
-            id=str(row[0]),
+            id=row[0],
             tenant_id="",  # Not stored in tenant database (each tenant has own DB)
-            source_node_id=str(row[1]),
-            target_node_id=str(row[2]),
+            source_node_id=row[1],
+            target_node_id=row[2],
             relationship_type=row[3],
             data=row[4] or "{}",
             created_at=row[5],
@@ -0,0 +1,49 @@
+"""
+Coalescing of concurrent identical lookups.
+"""
+
+import asyncio
+import copy
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Run at most one lookup per key at a time.
+
+    Callers that ask for a key while its lookup is still in flight await the
+    same result (or exception) instead of issuing their own query. Each caller
+    gets its own copy of the result so none can mutate another's instance.
+    """
+
+    __slots__ = ("_inflight",)
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, sharing it with concurrent callers for key."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._forget_future(key, future))
+        # Shielded so one caller going away doesn't cancel the others' lookup
+        return copy.copy(await asyncio.shield(future))
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Stop sharing the in-flight lookup for key, if any.
+
+        Called after a write so later callers start a fresh lookup instead of
+        joining one that may return the pre-write value. Callers already
+        waiting still get the old lookup's result.
+        """
+        self._inflight.pop(key, None)
+
+    def _forget_future(self, key: Hashable, future: "asyncio.Future[T]") -> None:
+        # A forgotten lookup finishing must not drop the fresh one for its key
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
@@ -0,0 +1,48 @@
+"""
+Server-side cursor streaming helpers.
+
+Used by the repositories' iter_all methods so exports and other full scans
+hold at most two batches of rows in memory instead of the whole result set.
+"""
+
+import asyncio
+from typing import AsyncIterator, Callable, TypeVar
+
+import asyncpg
+
+T = TypeVar("T")
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def stream_rows(
+    pool: asyncpg.Pool,
+    query: str,
+    convert: Callable[[asyncpg.Record], T],
+    *args,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[T]:
+    """
+    Yield converted rows of a query through a server-side cursor.
+
+    The next batch is fetched while the caller consumes the current one. The
+    pooled connection and its transaction stay open until the iterator is
+    exhausted or closed, so callers should not hold it open indefinitely.
+    """
+    async with pool.acquire() as conn:
+        # Cursors only live inside a transaction
+        async with conn.transaction():
+            cursor = await conn.cursor(query, *args)
+            batch = await cursor.fetch(batch_size)
+            while batch:
+                # A short batch means the cursor is drained
+                next_batch = None
+                if len(batch) == batch_size:
+                    next_batch = asyncio.ensure_future(cursor.fetch(batch_size))
+                try:
+                    for row in batch:
+                        yield convert(row)
+                finally:
+                    # Let the in-flight fetch finish so the connection is idle
+                    # before the transaction ends or the next fetch starts
+                    batch = await next_batch if next_batch is not None else []
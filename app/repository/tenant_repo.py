@@ -2,65 +2,96 @@
 Tenant repository implementation.
 """
 
-import uuid
-from datetime import datetime
-from typing import List, Tuple
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
 
 import asyncpg
 
 from app.db.database import Database
 from app.repository.models import Tenant, ListOptions, ListResult
+from app.repository.pagination import (
+    decode_created_at_token,
+    encode_created_at_token,
+    total_from_page,
+)
+from app.repository.streaming import DEFAULT_BATCH_SIZE, stream_rows
+from app.repository.cache import EntityCache
 from app.repository.errors import NotFoundError
+from app.repository.singleflight import SingleFlight
+
+
+def _row_to_tenant(row: asyncpg.Record) -> Tenant:
+    """
+    Convert a database row to a Tenant object.
+    
+    Columns are read by position, so every query feeding this must select
+    id, slug, name, status, created_at, updated_at in that order.
+    """
+    return Tenant(
+        id=row[0],
+        slug=row[1],
+        name=row[2],
+        status=row[3],
+        created_at=row[4],
+        updated_at=row[5],
+    )
 
 
 class TenantRepository:
     """PostgreSQL tenant repository."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, cache: Optional[EntityCache[Tenant]] = None):
         self.db = db
+        # Tenants change rarely, so lookups by id are served from memory for a
+        # short TTL; writes through this repository keep the cache current
+        self.cache = cache if cache is not None else EntityCache()
+        # Concurrent misses for the same id share one query
+        self._lookups: SingleFlight[Tenant] = SingleFlight()
 
     async def create(self, tenant: Tenant) -> Tenant:
-        """Create a new tenant."""
-        tenant.id = str(uuid.uuid4())
-        tenant.created_at = datetime.now()
-        tenant.updated_at = datetime.now()
+        """Create a new tenant. The id and timestamps are assigned by the database."""
         if not tenant.status:
             tenant.status = "active"
 
         query = """
-            INSERT INTO tenants (id, slug, name, status, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5, $6)
+            INSERT INTO tenants (slug, name, status)
+            VALUES ($1, $2, $3)
             RETURNING id, slug, name, status, created_at, updated_at
         """
 
         async with self.db.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                query,
-                tenant.id, tenant.slug, tenant.name, tenant.status,
-                tenant.created_at, tenant.updated_at
-            )
+            row = await conn.fetchrow(query, tenant.slug, tenant.name, tenant.status)
 
-        return self._row_to_tenant(row)
+        return _row_to_tenant(row)
 
     async def get_by_id(self, id: str) -> Tenant:
         """Retrieve a tenant by ID."""
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        return await self._lookups.do(id, lambda: self._fetch_by_id(id))
+
+    async def _fetch_by_id(self, id: str) -> Tenant:
+        """Load a tenant from the database and cache it."""
         query = "SELECT id, slug, name, status, created_at, updated_at FROM tenants WHERE id = $1"
 
+        # A write landing while this query is in flight makes the row stale
+        generation = self.cache.generation(id)
         async with self.db.pool.acquire() as conn:
             row = await conn.fetchrow(query, id)
 
         if not row:
             raise NotFoundError(f"tenant not found: {id}")
 
-        return self._row_to_tenant(row)
+        tenant = _row_to_tenant(row)
+        self.cache.put_if_unchanged(id, tenant, generation)
+        return tenant
 
     async def update(self, tenant: Tenant) -> Tenant:
         """Update an existing tenant."""
-        tenant.updated_at = datetime.now()
-
         query = """
             UPDATE tenants 
-            SET slug = $2, name = $3, status = $4, updated_at = $5
+            SET slug = $2, name = $3, status = $4, updated_at = NOW()
             WHERE id = $1
             RETURNING id, slug, name, status, created_at, updated_at
         """
@@ -68,13 +99,47 @@ class TenantRepository:
         async with self.db.pool.acquire() as conn:
             row = await conn.fetchrow(
                 query,
-                tenant.id, tenant.slug, tenant.name, tenant.status, tenant.updated_at
+                tenant.id, tenant.slug, tenant.name, tenant.status
             )
 
+        self._lookups.forget(tenant.id)
+
         if not row:
             raise NotFoundError(f"tenant not found: {tenant.id}")
 
-        return self._row_to_tenant(row)
+        updated = _row_to_tenant(row)
+        self.cache.put(updated.id, updated)
+        return updated
+
+    async def update_partial(
+        self,
+        id: str,
+        slug: Optional[str] = None,
+        name: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Tenant:
+        """Update only the given fields of a tenant in a single statement."""
+        query = """
+            UPDATE tenants
+            SET slug = COALESCE($2, slug),
+                name = COALESCE($3, name),
+                status = COALESCE($4, status),
+                updated_at = NOW()
+            WHERE id = $1
+            RETURNING id, slug, name, status, created_at, updated_at
+        """
+
+        async with self.db.pool.acquire() as conn:
+            row = await conn.fetchrow(query, id, slug, name, status)
+
+        self._lookups.forget(id)
+
+        if not row:
+            raise NotFoundError(f"tenant not found: {id}")
+
+        updated = _row_to_tenant(row)
+        self.cache.put(id, updated)
+        return updated
 
     async def delete(self, id: str) -> None:
         """Delete a tenant by ID."""
@@ -83,49 +148,67 @@ class TenantRepository:
         async with self.db.pool.acquire() as conn:
             result = await conn.execute(query, id)
 
+        self._lookups.forget(id)
+        self.cache.invalidate(id)
+
         # Check if any row was affected
         if result == "DELETE 0":
             raise NotFoundError(f"tenant not found: {id}")
 
     async def list(self, opts: ListOptions) -> Tuple[List[Tenant], ListResult]:
-        """Retrieve tenants with pagination."""
+        """Retrieve tenants with keyset pagination, newest first."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
-
-        async with self.db.pool.acquire() as conn:
-            # Get total count
-            total_count = await conn.fetchval("SELECT COUNT(*) FROM tenants")
+        cursor = decode_created_at_token(opts.page_token)
 
-            # Get tenants
+        # Fetch one extra row to learn whether another page follows
+        if cursor is None:
+            query = """
+                SELECT id, slug, name, status, created_at, updated_at
+                FROM tenants
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
+            """
+            args = (page_size + 1,)
+        else:
             query = """
-                SELECT id, slug, name, status, created_at, updated_at 
-                FROM tenants 
-                ORDER BY created_at DESC 
-                LIMIT $1 OFFSET $2
+                SELECT id, slug, name, status, created_at, updated_at
+                FROM tenants
+                WHERE (created_at, id) < ($2, $3)
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
             """
-            rows = await conn.fetch(query, page_size, offset)
-
-        tenants = [self._row_to_tenant(row) for row in rows]
-
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(tenants)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
-
-        return tenants, result
-
-    def _row_to_tenant(self, row: asyncpg.Record) -> Tenant:
-        """Convert a database row to a Tenant object."""
-        return Tenant(
-            id=str(row["id"]),
-            slug=row["slug"],
-            name=row["name"],
-            status=row["status"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+            args = (page_size + 1, *cursor)
+
+        total_count = None
+        if opts.include_total and cursor is not None:
+            # Count on a second pooled connection while the page is fetched
+            rows, total_count = await asyncio.gather(
+                self.db.pool.fetch(query, *args),
+                self.db.pool.fetchval("SELECT COUNT(*) FROM tenants"),
+            )
+        else:
+            async with self.db.pool.acquire() as conn:
+                rows = await conn.fetch(query, *args)
+                if opts.include_total:
+                    # A first page with no page after it holds every row
+                    total_count = total_from_page(0, page_size + 1, len(rows))
+                    if total_count is None:
+                        total_count = await conn.fetchval("SELECT COUNT(*) FROM tenants")
+
+        tenants = list(map(_row_to_tenant, rows[:page_size]))
+
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = tenants[-1]
+            next_page_token = encode_created_at_token(last.created_at, last.id)
+
+        return tenants, ListResult(next_page_token, total_count)
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[Tenant]:
+        """Stream every tenant, newest first, without loading them all at once."""
+        query = """
+            SELECT id, slug, name, status, created_at, updated_at
+            FROM tenants
+            ORDER BY created_at DESC, id DESC
+        """
+        return stream_rows(self.db.pool, query, _row_to_tenant, batch_size=batch_size)
@@ -2,62 +2,102 @@
 User repository implementation.
 """
 
-import uuid
-from datetime import datetime
-from typing import List, Tuple
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
 
 import asyncpg
 
 from app.db.database import Database
 from app.repository.models import User, TenantUser, ListOptions, ListResult
+from app.repository.pagination import (
+    decode_created_at_token,
+    decode_id_token,
+    encode_created_at_token,
+    encode_id_token,
+    total_from_page,
+)
+from app.repository.streaming import DEFAULT_BATCH_SIZE, stream_rows
+from app.repository.cache import EntityCache
 from app.repository.errors import NotFoundError
+from app.repository.singleflight import SingleFlight
+
+
+# Both converters read columns by position, so the queries feeding them must
+# keep their SELECT / RETURNING column order in sync.
+
+def _row_to_user(row: asyncpg.Record) -> User:
+    """Convert an (id, email, display_name, created_at, updated_at) row to a User."""
+    return User(
+        id=row[0],
+        email=row[1],
+        display_name=row[2],
+        created_at=row[3],
+        updated_at=row[4],
+    )
+
+
+def _row_to_tenant_user(row: asyncpg.Record) -> TenantUser:
+    """Convert a (tenant_id, user_id, role, status) row to a TenantUser."""
+    return TenantUser(
+        tenant_id=row[0],
+        user_id=row[1],
+        role=row[2],
+        status=row[3],
+    )
 
 
 class UserRepository:
     """PostgreSQL user repository."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, cache: Optional[EntityCache[User]] = None):
         self.db = db
+        # Users change rarely, so lookups by id are served from memory for a
+        # short TTL; writes through this repository keep the cache current
+        self.cache = cache if cache is not None else EntityCache()
+        # Concurrent misses for the same id share one query
+        self._lookups: SingleFlight[User] = SingleFlight()
 
     async def create(self, user: User) -> User:
-        """Create a new user."""
-        user.id = str(uuid.uuid4())
-        user.created_at = datetime.now()
-        user.updated_at = datetime.now()
-
+        """Create a new user. The id and timestamps are assigned by the database."""
         query = """
-            INSERT INTO users (id, email, display_name, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5)
+            INSERT INTO users (email, display_name)
+            VALUES ($1, $2)
             RETURNING id, email, display_name, created_at, updated_at
         """
 
         async with self.db.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                query,
-                user.id, user.email, user.display_name, user.created_at, user.updated_at
-            )
+            row = await conn.fetchrow(query, user.email, user.display_name)
 
-        return self._row_to_user(row)
+        return _row_to_user(row)
 
     async def get_by_id(self, id: str) -> User:
         """Retrieve a user by ID."""
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+        return await self._lookups.do(id, lambda: self._fetch_by_id(id))
+
+    async def _fetch_by_id(self, id: str) -> User:
+        """Load a user from the database and cache it."""
         query = "SELECT id, email, display_name, created_at, updated_at FROM users WHERE id = $1"
 
+        # A write landing while this query is in flight makes the row stale
+        generation = self.cache.generation(id)
         async with self.db.pool.acquire() as conn:
             row = await conn.fetchrow(query, id)
 
         if not row:
             raise NotFoundError(f"user not found: {id}")
 
-        return self._row_to_user(row)
+        user = _row_to_user(row)
+        self.cache.put_if_unchanged(id, user, generation)
+        return user
 
     async def update(self, user: User) -> User:
         """Update an existing user."""
-        user.updated_at = datetime.now()
-
         query = """
             UPDATE users 
-            SET email = $2, display_name = $3, updated_at = $4
+            SET email = $2, display_name = $3, updated_at = NOW()
             WHERE id = $1
             RETURNING id, email, display_name, created_at, updated_at
         """
@@ -65,13 +105,45 @@ class UserRepository:
         async with self.db.pool.acquire() as conn:
             row = await conn.fetchrow(
                 query,
-                user.id, user.email, user.display_name, user.updated_at
+                user.id, user.email, user.display_name
             )
 
+        self._lookups.forget(user.id)
+
         if not row:
             raise NotFoundError(f"user not found: {user.id}")
 
-        return self._row_to_user(row)
+        updated = _row_to_user(row)
+        self.cache.put(updated.id, updated)
+        return updated
+
+    async def update_partial(
+        self,
+        id: str,
+        email: Optional[str] = None,
+        display_name: Optional[str] = None,
+    ) -> User:
+        """Update only the given fields of a user in a single statement."""
+        query = """
+            UPDATE users
+            SET email = COALESCE($2, email),
+                display_name = COALESCE($3, display_name),
+                updated_at = NOW()
+            WHERE id = $1
+            RETURNING id, email, display_name, created_at, updated_at
+        """
+
+        async with self.db.pool.acquire() as conn:
+            row = await conn.fetchrow(query, id, email, display_name)
+
+        self._lookups.forget(id)
+
+        if not row:
+            raise NotFoundError(f"user not found: {id}")
+
+        updated = _row_to_user(row)
+        self.cache.put(id, updated)
+        return updated
 
     async def delete(self, id: str) -> None:
         """Delete a user by ID."""
@@ -80,60 +152,111 @@ class UserRepository:
         async with self.db.pool.acquire() as conn:
             result = await conn.execute(query, id)
 
+        self._lookups.forget(id)
+        self.cache.invalidate(id)
+
         if result == "DELETE 0":
             raise NotFoundError(f"user not found: {id}")
 
     async def list(self, opts: ListOptions) -> Tuple[List[User], ListResult]:
-        """Retrieve users with pagination."""
+        """Retrieve users with keyset pagination, newest first."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
-
-        async with self.db.pool.acquire() as conn:
-            total_count = await conn.fetchval("SELECT COUNT(*) FROM users")
+        cursor = decode_created_at_token(opts.page_token)
 
+        # Fetch one extra row to learn whether another page follows
+        if cursor is None:
             query = """
-                SELECT id, email, display_name, created_at, updated_at 
-                FROM users 
-                ORDER BY created_at DESC 
-                LIMIT $1 OFFSET $2
+                SELECT id, email, display_name, created_at, updated_at
+                FROM users
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
             """
-            rows = await conn.fetch(query, page_size, offset)
-
-        users = [self._row_to_user(row) for row in rows]
-
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(users)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
-
-        return users, result
+            args = (page_size + 1,)
+        else:
+            query = """
+                SELECT id, email, display_name, created_at, updated_at
+                FROM users
+                WHERE (created_at, id) < ($2, $3)
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1
+            """
+            args = (page_size + 1, *cursor)
+
+        total_count = None
+        if opts.include_total and cursor is not None:
+            # Count on a second pooled connection while the page is fetched
+            rows, total_count = await asyncio.gather(
+                self.db.pool.fetch(query, *args),
+                self.db.pool.fetchval("SELECT COUNT(*) FROM users"),
+            )
+        else:
+            async with self.db.pool.acquire() as conn:
+                rows = await conn.fetch(query, *args)
+                if opts.include_total:
+                    # A first page with no page after it holds every row
+                    total_count = total_from_page(0, page_size + 1, len(rows))
+                    if total_count is None:
+                        total_count = await conn.fetchval("SELECT COUNT(*) FROM users")
+
+        users = list(map(_row_to_user, rows[:page_size]))
+
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = users[-1]
+            next_page_token = encode_created_at_token(last.created_at, last.id)
+
+        return users, ListResult(next_page_token, total_count)
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[User]:
+        """Stream every user, newest first, without loading them all at once."""
+        query = """
+            SELECT id, email, display_name, created_at, updated_at
+            FROM users
+            ORDER BY created_at DESC, id DESC
+        """
+        return stream_rows(self.db.pool, query, _row_to_user, batch_size=batch_size)
 
     async def add_to_tenant(self, tenant_user: TenantUser) -> TenantUser:
         """Add a user to a tenant."""
-        if not tenant_user.role:
-            tenant_user.role = "member"
-        if not tenant_user.status:
-            tenant_user.status = "active"
+        added = await self.add_many_to_tenant([tenant_user])
+        return added[0]
+
+    async def add_many_to_tenant(self, tenant_users: List[TenantUser]) -> List[TenantUser]:
+        """
+        Add users to tenants in a single statement.
+        
+        Existing memberships have their role and status updated. If the same
+        (tenant_id, user_id) pair appears more than once, the last one wins.
+        """
+        memberships = {}
+        for tenant_user in tenant_users:
+            if not tenant_user.role:
+                tenant_user.role = "member"
+            if not tenant_user.status:
+                tenant_user.status = "active"
+            memberships[(tenant_user.tenant_id, tenant_user.user_id)] = tenant_user
+        if not memberships:
+            return []
 
         query = """
             INSERT INTO tenant_users (tenant_id, user_id, role, status)
-            VALUES ($1, $2, $3, $4)
-            ON CONFLICT (tenant_id, user_id) DO UPDATE SET role = $3, status = $4
+            SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::text[])
+            ON CONFLICT (tenant_id, user_id) DO UPDATE
+            SET role = EXCLUDED.role, status = EXCLUDED.status
             RETURNING tenant_id, user_id, role, status
         """
 
+        rows_in = list(memberships.values())
         async with self.db.pool.acquire() as conn:
-            row = await conn.fetchrow(
+            rows = await conn.fetch(
                 query,
-                tenant_user.tenant_id, tenant_user.user_id, tenant_user.role, tenant_user.status
+                [tu.tenant_id for tu in rows_in],
+                [tu.user_id for tu in rows_in],
+                [tu.role for tu in rows_in],
+                [tu.status for tu in rows_in],
             )
 
-        return self._row_to_tenant_user(row)
+        return list(map(_row_to_tenant_user, rows))
 
     async def remove_from_tenant(self, tenant_id: str, user_id: str) -> None:
         """Remove a user from a tenant."""
@@ -146,54 +269,56 @@ class UserRepository:
             raise NotFoundError(f"tenant_user not found: tenant_id={tenant_id}, user_id={user_id}")
 
     async def list_tenant_users(self, tenant_id: str, opts: ListOptions) -> Tuple[List[TenantUser], ListResult]:
-        """List users in a tenant."""
+        """List users in a tenant with keyset pagination, ordered by user_id."""
         page_size = max(1, min(opts.page_size or 10, 100))
-        offset = 0
-        if opts.page_token:
-            try:
-                offset = int(opts.page_token)
-            except ValueError:
-                offset = 0
-
-        async with self.db.pool.acquire() as conn:
-            total_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM tenant_users WHERE tenant_id = $1",
-                tenant_id
-            )
+        after_user_id = decode_id_token(opts.page_token)
 
+        # Fetch one extra row to learn whether another page follows
+        if after_user_id is None:
             query = """
-                SELECT tenant_id, user_id, role, status 
-                FROM tenant_users 
+                SELECT tenant_id, user_id, role, status
+                FROM tenant_users
                 WHERE tenant_id = $1
                 ORDER BY user_id
-                LIMIT $2 OFFSET $3
+                LIMIT $2
             """
-            rows = await conn.fetch(query, tenant_id, page_size, offset)
-
-        tenant_users = [self._row_to_tenant_user(row) for row in rows]
-
-        result = ListResult(total_count=total_count)
-        next_offset = offset + len(tenant_users)
-        if next_offset < total_count:
-            result.next_page_token = str(next_offset)
-
-        return tenant_users, result
-
-    def _row_to_user(self, row: asyncpg.Record) -> User:
-        """Convert a database row to a User object."""
-        return User(
-            id=str(row["id"]),
-            email=row["email"],
-            display_name=row["display_name"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
-
-    def _row_to_tenant_user(self, row: asyncpg.Record) -> TenantUser:
-        """Convert a database row to a TenantUser object."""
-        return TenantUser(
-            tenant_id=str(row["tenant_id"]),
-            user_id=str(row["user_id"]),
-            role=row["role"],
-            status=row["status"],
-        )
+            args = (tenant_id, page_size + 1)
+        else:
+            query = """
+                SELECT tenant_id, user_id, role, status
+                FROM tenant_users
+                WHERE tenant_id = $1 AND user_id > $3
+                ORDER BY user_id
+                LIMIT $2
+            """
+            args = (tenant_id, page_size + 1, after_user_id)
+
+        total_count = None
+        if opts.include_total and after_user_id is not None:
+            # Count on a second pooled connection while the page is fetched
+            rows, total_count = await asyncio.gather(
+                self.db.pool.fetch(query, *args),
+                self.db.pool.fetchval(
+                    "SELECT COUNT(*) FROM tenant_users WHERE tenant_id = $1",
+                    tenant_id
+                ),
+            )
+        else:
+            async with self.db.pool.acquire() as conn:
+                rows = await conn.fetch(query, *args)
+                if opts.include_total:
+                    # A first page with no page after it holds every row
+                    total_count = total_from_page(0, page_size + 1, len(rows))
+                    if total_count is None:
+                        total_count = await conn.fetchval(
+                            "SELECT COUNT(*) FROM tenant_users WHERE tenant_id = $1",
+                            tenant_id
+                        )
+
+        tenant_users = list(map(_row_to_tenant_user, rows[:page_size]))
+
+        next_page_token = ""
+        if len(rows) > page_size:
+            next_page_token = encode_id_token(tenant_users[-1].user_id)
+
+        return tenant_users, ListResult(next_page_token, total_count)
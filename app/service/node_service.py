@@ -40,12 +40,8 @@ class NodeService:
         if not id:
             raise ValueError("id is required")
 
-        node = await self.repo.get_by_id(id)
-
-        if data:
-            node.data = data
-
-        return await self.repo.update(node)
+        # Empty data means "not provided" and leaves the column unchanged
+        return await self.repo.update_partial(id, data or None)
 
     async def delete(self, id: str) -> None:
         """Delete a node."""
@@ -37,16 +37,8 @@ class NodeTypeService:
         if not id:
             raise ValueError("id is required")
 
-        node_type = await self.repo.get_by_id(id)
-
-        if name:
-            node_type.name = name
-        if description:
-            node_type.description = description
-        if schema:
-            node_type.schema = schema
-
-        return await self.repo.update(node_type)
+        # Empty strings mean "not provided" and leave the column unchanged
+        return await self.repo.update_partial(id, name or None, description or None, schema or None)
 
     async def delete(self, id: str) -> None:
         """Delete a node type."""
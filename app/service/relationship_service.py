@@ -55,14 +55,8 @@ class RelationshipService:
         if not id:
             raise ValueError("id is required")
 
-        rel = await self.repo.get_by_id(id)
-
-        if rel_type:
-            rel.relationship_type = rel_type
-        if data:
-            rel.data = data
-
-        return await self.repo.update(rel)
+        # Empty strings mean "not provided" and leave the column unchanged
+        return await self.repo.update_partial(id, rel_type or None, data or None)
 
     async def delete(self, id: str) -> None:
         """Delete a relationship."""
@@ -46,16 +46,8 @@ class TenantService:
         if not id:
             raise ValueError("id is required")
 
-        tenant = await self.repo.get_by_id(id)
-
-        if slug:
-            tenant.slug = slug
-        if name:
-            tenant.name = name
-        if status:
-            tenant.status = status
-
-        return await self.repo.update(tenant)
+        # Empty strings mean "not provided" and leave the column unchanged
+        return await self.repo.update_partial(id, slug or None, name or None, status or None)
 
     async def delete(self, id: str) -> None:
         """Delete a tenant."""
@@ -63,7 +55,13 @@ class TenantService:
             raise ValueError("id is required")
         await self.repo.delete(id)
 
-    async def list(self, page_size: int, page_token: str) -> Tuple[List[Tenant], ListResult]:
+        # Drop the cached pool so its tenant-scoped services stop resolving
+        if self.tenant_db_manager:
+            await self.tenant_db_manager.evict_tenant_pool(id)
+
+    async def list(
+        self, page_size: int, page_token: str, include_total: bool = False
+    ) -> Tuple[List[Tenant], ListResult]:
         """Retrieve tenants with pagination."""
-        opts = ListOptions(page_size=page_size, page_token=page_token)
+        opts = ListOptions(page_size=page_size, page_token=page_token, include_total=include_total)
         return await self.repo.list(opts)
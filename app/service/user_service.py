@@ -34,14 +34,8 @@ class UserService:
         if not id:
             raise ValueError("id is required")
 
-        user = await self.repo.get_by_id(id)
-
-        if email:
-            user.email = email
-        if display_name:
-            user.display_name = display_name
-
-        return await self.repo.update(user)
+        # Empty strings mean "not provided" and leave the column unchanged
+        return await self.repo.update_partial(id, email or None, display_name or None)
 
     async def delete(self, id: str) -> None:
         """Delete a user."""
@@ -49,9 +43,11 @@ class UserService:
             raise ValueError("id is required")
         await self.repo.delete(id)
 
-    async def list(self, page_size: int, page_token: str) -> Tuple[List[User], ListResult]:
+    async def list(
+        self, page_size: int, page_token: str, include_total: bool = False
+    ) -> Tuple[List[User], ListResult]:
         """Retrieve users with pagination."""
-        opts = ListOptions(page_size=page_size, page_token=page_token)
+        opts = ListOptions(page_size=page_size, page_token=page_token, include_total=include_total)
         return await self.repo.list(opts)
 
     async def add_to_tenant(self, tenant_id: str, user_id: str, role: str) -> TenantUser:
@@ -72,10 +68,12 @@ class UserService:
             raise ValueError("user_id is required")
         await self.repo.remove_from_tenant(tenant_id, user_id)
 
-    async def list_tenant_users(self, tenant_id: str, page_size: int, page_token: str) -> Tuple[List[TenantUser], ListResult]:
+    async def list_tenant_users(
+        self, tenant_id: str, page_size: int, page_token: str, include_total: bool = False
+    ) -> Tuple[List[TenantUser], ListResult]:
         """List users in a tenant."""
         if not tenant_id:
             raise ValueError("tenant_id is required")
 
-        opts = ListOptions(page_size=page_size, page_token=page_token)
+        opts = ListOptions(page_size=page_size, page_token=page_token, include_total=include_total)
         return await self.repo.list_tenant_users(tenant_id, opts)
@@ -5,6 +5,7 @@ flex-db Python Backend - Main Entry Point
 A Database-as-a-Service (DBaaS) implemented in Python with JSON-RPC API.
 """
 
+import asyncio
 import logging
 import os
 import sys
@@ -12,6 +13,7 @@ import sys
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
@@ -26,12 +28,16 @@ from app.repository import (
     TenantRepository,
     UserRepository,
 )
+from app.repository.cache import EntityCache
 from app.service import (
     TenantService,
     UserService,
 )
 from app.jsonrpc import register_methods, jsonrpc_router
-from app.api.dependencies import set_tenant_db_manager
+from app.jsonrpc.openrpc import get_openrpc_spec_json
+from app.api.dependencies import set_control_services, set_tenant_db_manager
+from app.api.etag import ETagMiddleware
+from app.api.exception_handlers import register_exception_handlers
 
 # Configure logging
 logging.basicConfig(
@@ -63,6 +69,15 @@ async def lifespan(app: FastAPI):
     # Load configuration from environment variables
     cfg = config_from_env()
 
+    # Optionally log any callback that blocks the event loop for too long.
+    # asyncio debug mode is slow, so this is for diagnosing, not production.
+    slow_callback_ms = os.getenv("SLOW_CALLBACK_MS")
+    if slow_callback_ms:
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = float(slow_callback_ms) / 1000
+        logger.info(f"Logging event loop callbacks slower than {slow_callback_ms}ms")
+
     # Ensure control database exists
     logger.info("Ensuring control database exists...")
     try:
@@ -101,9 +116,18 @@ async def lifespan(app: FastAPI):
         await _control_db.close()
         sys.exit(1)
 
-    # Initialize control database repositories
-    tenant_repo = TenantRepository(_control_db)
-    user_repo = UserRepository(_control_db)
+    # Open pools for the most recent tenants so their first requests are warm
+    if cfg.prewarm_tenant_pools > 0:
+        try:
+            await _tenant_db_manager.prewarm(limit=cfg.prewarm_tenant_pools)
+        except Exception as e:
+            logger.error(f"Failed to prewarm tenant database pools: {e}")
+
+    # Initialize control database repositories. Their id caches are per
+    # process, so they're disabled when other workers could write the same rows.
+    cache_size = 0 if int(os.getenv("WORKERS", "1")) > 1 else 1024
+    tenant_repo = TenantRepository(_control_db, EntityCache(max_size=cache_size))
+    user_repo = UserRepository(_control_db, EntityCache(max_size=cache_size))
 
     # Initialize control database services (tenant and user services work with control DB)
     tenant_svc = TenantService(tenant_repo, _tenant_db_manager)
@@ -111,6 +135,10 @@ async def lifespan(app: FastAPI):
 
     # Register JSON-RPC methods (tenant-scoped services are resolved per-request)
     register_methods(tenant_svc, user_svc)
+    set_control_services(tenant_svc, user_svc)
+
+    # Build the OpenRPC spec now so the first discovery request doesn't pay for it
+    get_openrpc_spec_json()
 
     logger.info("Services initialized successfully")
     
@@ -134,6 +162,7 @@ def create_app() -> FastAPI:
         docs_url=None,  # Disable Swagger UI (we use OpenRPC instead)
         redoc_url=None,  # Disable ReDoc (we use OpenRPC instead)
         openapi_url=None,  # Disable OpenAPI schema (we use OpenRPC instead)
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
     
@@ -148,6 +177,12 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Tag GET responses so clients can revalidate with If-None-Match
+    app.add_middleware(ETagMiddleware)
+    
+    # Translate service errors raised by route handlers
+    register_exception_handlers(app)
+    
     # Register JSON-RPC router
     app.include_router(jsonrpc_router)
     
@@ -179,4 +214,9 @@ if __name__ == "__main__":
         host=host,
         port=port,
         reload=os.getenv("RELOAD", "false").lower() == "true",
+        workers=int(os.getenv("WORKERS", "1")),
+        # uvloop's event loop and the httptools parser are both C extensions
+        loop="uvloop",
+        http="httptools",
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true",
     )
@@ -0,0 +1,85 @@
+"""
+Tests for tenant service resolution and pool eviction.
+"""
+
+import asyncio
+
+import pytest
+
+from app.api import dependencies
+from app.config import Config
+from app.db.tenant_db_manager import TenantDatabaseManager
+from app.service import TenantService
+
+
+class _FakeDatabase:
+    """Stand-in for a tenant Database that only records being closed."""
+
+    def __init__(self):
+        self.closed = False
+        # Set to hold close() open, like a pool waiting on a slow query
+        self.release = None
+
+    async def close(self) -> None:
+        if self.release is not None:
+            await self.release.wait()
+        self.closed = True
+
+
+class _FakeTenantRepository:
+    """Tenant repository whose deletes always succeed."""
+
+    async def delete(self, id: str) -> None:
+        pass
+
+
+class _FakeTenantDatabaseManager(TenantDatabaseManager):
+    """Manager whose tenant pools are fakes instead of real connections."""
+
+    async def _load_tenant_db(self, tenant_id: str):
+        db = _FakeDatabase()
+        self._cache_put(tenant_id, db)
+        return db
+
+
+@pytest.fixture
+def manager(monkeypatch) -> TenantDatabaseManager:
+    manager = _FakeTenantDatabaseManager(Config(max_cached_tenant_pools=2))
+    monkeypatch.setattr(dependencies, "_tenant_db_manager", None)
+    monkeypatch.setattr(dependencies, "_services_cache", {})
+    dependencies.set_tenant_db_manager(manager)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_tenant_in_use_survives_eviction(manager):
+    """Test that requests served from the services cache keep a pool recent."""
+    await dependencies.resolve_tenant_services("busy")
+    await dependencies.resolve_tenant_services("idle")
+
+    # Only the services cache is hit here, never the manager's lookup path
+    await dependencies.resolve_tenant_services("busy")
+    await dependencies.resolve_tenant_services("new")
+
+    assert set(manager._tenant_pools) == {"busy", "new"}
+    assert "idle" not in dependencies._services_cache
+    assert "busy" in dependencies._services_cache
+
+
+@pytest.mark.asyncio
+async def test_deleted_tenant_services_no_longer_resolve(manager):
+    """Test that deleting a tenant drops its services without awaiting the pool close."""
+    services = await dependencies.resolve_tenant_services("t1")
+    db = manager._tenant_pools["t1"]
+    db.release = asyncio.Event()
+
+    await TenantService(_FakeTenantRepository(), manager).delete("t1")
+
+    assert "t1" not in manager._tenant_pools
+    assert "t1" not in dependencies._services_cache
+    assert not db.closed
+
+    db.release.set()
+    await asyncio.gather(*manager._closing_tasks)
+    assert db.closed
+    assert await dependencies.resolve_tenant_services("t1") is not services
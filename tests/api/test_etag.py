@@ -0,0 +1,78 @@
+"""
+Tests for the ETag middleware.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from httpx import AsyncClient
+
+from app.api.etag import LIST_CACHE_HEADERS, ETagMiddleware, compute_etag, etag_matches
+
+
+def _etag_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+    
+    @app.get("/item")
+    async def get_item():
+        return {"id": "1", "name": "Item"}
+    
+    @app.get("/items")
+    async def list_items():
+        return ORJSONResponse({"items": [{"id": "1"}]}, headers=LIST_CACHE_HEADERS)
+    
+    @app.post("/item")
+    async def post_item():
+        return {"id": "1", "name": "Item"}
+    
+    return app
+
+
+def test_etag_matches():
+    """Test weak comparison against If-None-Match values."""
+    etag = compute_etag(b"body")
+    
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches('W/"other", ' + etag, etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"other"', etag)
+
+
+@pytest.mark.asyncio
+async def test_get_returns_304_when_etag_matches():
+    """Test that a matching If-None-Match gets an empty 304."""
+    async with AsyncClient(app=_etag_app(), base_url="http://test") as client:
+        first = await client.get("/item")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        
+        second = await client.get("/item", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_304_keeps_cache_headers():
+    """Test that a 304 carries the 200's caching headers but no body headers."""
+    async with AsyncClient(app=_etag_app(), base_url="http://test") as client:
+        first = await client.get("/items")
+        etag = first.headers["etag"]
+        
+        second = await client.get("/items", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["cache-control"] == LIST_CACHE_HEADERS["Cache-Control"]
+        assert "content-type" not in second.headers
+        assert "content-length" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_non_get_responses_are_not_tagged():
+    """Test that only GET responses carry an ETag."""
+    async with AsyncClient(app=_etag_app(), base_url="http://test") as client:
+        response = await client.post("/item")
+        assert response.status_code == 200
+        assert "etag" not in response.headers
@@ -0,0 +1,44 @@
+"""
+Tests for the REST API exception handlers.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.exception_handlers import register_exception_handlers
+from app.repository.errors import NotFoundError
+
+
+def _failing_app() -> FastAPI:
+    app = FastAPI()
+    register_exception_handlers(app)
+
+    @app.get("/missing")
+    async def missing():
+        raise NotFoundError("tenant not found: t1")
+
+    @app.get("/unavailable")
+    async def unavailable():
+        raise HTTPException(status_code=503, detail="Tenant service not initialized")
+
+    @app.get("/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_errors_share_one_json_shape():
+    """Test that service, HTTP and unexpected errors all render as ErrorResponse."""
+    transport = httpx.ASGITransport(app=_failing_app(), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path, status_code, message in [
+            ("/missing", 404, "tenant not found: t1"),
+            ("/unavailable", 503, "Tenant service not initialized"),
+            ("/broken", 500, "boom"),
+        ]:
+            response = await client.get(path)
+            assert response.status_code == status_code
+            assert response.json() == {"error": {"code": status_code, "message": message}}
@@ -0,0 +1,3 @@
+"""
+Tenant database manager tests.
+"""
@@ -0,0 +1,46 @@
+"""
+Tests for tenant pool creation locking.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import Config
+from app.db.tenant_db_manager import TenantDatabaseManager
+
+
+class _FailingTenantDatabaseManager(TenantDatabaseManager):
+    """Manager whose pool loads fail, recording how many overlap."""
+
+    def __init__(self):
+        super().__init__(Config())
+        self.active = 0
+        self.max_active = 0
+        self.late_callers = []
+
+    async def _load_tenant_db(self, tenant_id: str):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if not self.late_callers:
+            # Arrives after this load releases the lock but before the
+            # waiter it wakes has acquired it
+            self.late_callers.append(asyncio.create_task(self.get_tenant_db(tenant_id)))
+        raise ValueError(f"Tenant not found: {tenant_id}")
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_never_overlap():
+    """Test that a failed pool load doesn't let a new caller race its waiters."""
+    manager = _FailingTenantDatabaseManager()
+
+    results = await asyncio.gather(
+        manager.get_tenant_db("t1"), manager.get_tenant_db("t1"), return_exceptions=True
+    )
+    results += await asyncio.gather(*manager.late_callers, return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert manager.max_active == 1
+    assert manager._creation_locks == {}
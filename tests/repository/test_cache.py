@@ -0,0 +1,61 @@
+"""
+Tests for the repository entity cache.
+"""
+
+from app.repository.cache import EntityCache
+from app.repository.models import Tenant
+
+
+def test_cache_returns_copies():
+    """Test that mutating a cached entity doesn't change the cache."""
+    cache = EntityCache()
+    cache.put("t1", Tenant(id="t1", name="Tenant"))
+    
+    cached = cache.get("t1")
+    cached.name = "Changed"
+    
+    assert cache.get("t1").name == "Tenant"
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is evicted when full."""
+    cache = EntityCache(max_size=2)
+    cache.put("a", Tenant(id="a"))
+    cache.put("b", Tenant(id="b"))
+    cache.get("a")
+    cache.put("c", Tenant(id="c"))
+    
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_cache_expires_and_invalidates():
+    """Test that expired and invalidated entries are misses."""
+    expired = EntityCache(ttl=0)
+    expired.put("a", Tenant(id="a"))
+    assert expired.get("a") is None
+    
+    cache = EntityCache()
+    cache.put("a", Tenant(id="a"))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+def test_lookup_racing_a_write_is_not_cached():
+    """Test that a row loaded before a write or delete isn't cached after it."""
+    cache = EntityCache()
+    
+    generation = cache.generation("a")
+    cache.invalidate("a")
+    cache.put_if_unchanged("a", Tenant(id="a", name="Deleted"), generation)
+    assert cache.get("a") is None
+    
+    generation = cache.generation("a")
+    cache.put("a", Tenant(id="a", name="New"))
+    cache.put_if_unchanged("a", Tenant(id="a", name="Old"), generation)
+    assert cache.get("a").name == "New"
+    
+    generation = cache.generation("b")
+    cache.put_if_unchanged("b", Tenant(id="b"), generation)
+    assert cache.get("b") is not None
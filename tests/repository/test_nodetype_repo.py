@@ -116,5 +116,22 @@ async def test_list_node_types_pagination(nodetype_repo):
     
     assert len(node_types1) == 5
     assert result1.total_count == 15
-    assert result1.next_page_token == "5"
+    assert result1.next_page_token != ""
+    
+    # Second page
+    node_types2, result2 = await nodetype_repo.list(ListOptions(page_size=5, page_token=result1.next_page_token))
+    
+    assert len(node_types2) == 5
+    assert result2.total_count == 15
+    assert result2.next_page_token != ""
+    
+    # Last page
+    node_types3, result3 = await nodetype_repo.list(ListOptions(page_size=5, page_token=result2.next_page_token))
+    
+    assert len(node_types3) == 5
+    assert result3.next_page_token == ""
+    
+    # Pages don't overlap
+    ids = {nt.id for nt in node_types1 + node_types2 + node_types3}
+    assert len(ids) == 15
 
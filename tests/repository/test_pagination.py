@@ -0,0 +1,49 @@
+"""
+Tests for keyset pagination tokens.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from app.repository.pagination import (
+    decode_created_at_token,
+    decode_id_token,
+    encode_created_at_token,
+    encode_id_token,
+    total_from_page,
+)
+
+
+def test_created_at_token_round_trip():
+    """Test encoding and decoding a (created_at, id) cursor."""
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    id = str(uuid.uuid4())
+    
+    token = encode_created_at_token(created_at, id)
+    
+    assert decode_created_at_token(token) == (created_at, id)
+
+
+def test_id_token_round_trip():
+    """Test encoding and decoding a single-id cursor."""
+    id = str(uuid.uuid4())
+    
+    assert decode_id_token(encode_id_token(id)) == id
+
+
+def test_invalid_tokens_start_from_first_page():
+    """Test that empty, legacy offset, and malformed tokens decode to None."""
+    for token in ["", "5", "not base64!", encode_id_token("not-a-uuid")]:
+        assert decode_created_at_token(token) is None
+        assert decode_id_token(token) is None
+
+
+def test_total_from_page():
+    """Test that only short pages settle the total without a COUNT."""
+    assert total_from_page(0, 10, 3) == 3
+    assert total_from_page(0, 10, 0) == 0
+    assert total_from_page(20, 10, 4) == 24
+    # A full page may have more rows after it
+    assert total_from_page(0, 10, 10) is None
+    # An empty page past the first may have overshot the end
+    assert total_from_page(20, 10, 0) is None
@@ -0,0 +1,83 @@
+"""
+Tests for coalescing concurrent lookups.
+"""
+
+import asyncio
+
+import pytest
+
+from app.repository.errors import NotFoundError
+from app.repository.models import Node
+from app.repository.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_call():
+    """Test that callers for the same key share a single lookup."""
+    flight = SingleFlight()
+    calls = 0
+    
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return Node(id="n1")
+    
+    nodes = await asyncio.gather(*(flight.do("n1", fetch) for _ in range(5)))
+    
+    assert calls == 1
+    assert all(node.id == "n1" for node in nodes)
+    # Each caller gets its own instance
+    assert len({id(node) for node in nodes}) == 5
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_are_not_kept():
+    """Test that a failed lookup raises for all waiters and is retried later."""
+    flight = SingleFlight()
+    
+    async def missing():
+        await asyncio.sleep(0.01)
+        raise NotFoundError("node not found: n1")
+    
+    results = await asyncio.gather(
+        flight.do("n1", missing), flight.do("n1", missing), return_exceptions=True
+    )
+    assert all(isinstance(r, NotFoundError) for r in results)
+    
+    async def found():
+        return Node(id="n1")
+    
+    assert (await flight.do("n1", found)).id == "n1"
+
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_fresh_lookup():
+    """Test that a lookup issued after forget() doesn't join the earlier one."""
+    flight = SingleFlight()
+    stale_done = asyncio.Event()
+    fresh_done = asyncio.Event()
+    
+    async def before_write():
+        await stale_done.wait()
+        return Node(id="n1", data="old")
+    
+    async def after_write():
+        await fresh_done.wait()
+        return Node(id="n1", data="new")
+    
+    stale = asyncio.ensure_future(flight.do("n1", before_write))
+    await asyncio.sleep(0)
+    flight.forget("n1")
+    fresh = asyncio.ensure_future(flight.do("n1", after_write))
+    await asyncio.sleep(0)
+    
+    # The forgotten lookup finishing doesn't drop the fresh one
+    stale_done.set()
+    assert (await stale).data == "old"
+    joined = asyncio.ensure_future(flight.do("n1", before_write))
+    
+    fresh_done.set()
+    assert (await fresh).data == "new"
+    assert (await joined).data == "new"
@@ -86,6 +86,20 @@ async def test_delete_tenant(tenant_repo):
         await tenant_repo.get_by_id(created.id)
 
 
+@pytest.mark.asyncio
+async def test_cached_tenant_tracks_writes(tenant_repo):
+    """Test that a cached tenant is refreshed on update and dropped on delete."""
+    created = await tenant_repo.create(Tenant(slug="test-tenant", name="Test Tenant"))
+    await tenant_repo.get_by_id(created.id)
+    
+    await tenant_repo.update_partial(created.id, name="Renamed Tenant")
+    assert (await tenant_repo.get_by_id(created.id)).name == "Renamed Tenant"
+    
+    await tenant_repo.delete(created.id)
+    with pytest.raises(NotFoundError):
+        await tenant_repo.get_by_id(created.id)
+
+
 @pytest.mark.asyncio
 async def test_delete_tenant_not_found(tenant_repo):
     """Test deleting a non-existent tenant raises NotFoundError."""
@@ -104,10 +118,24 @@ async def test_list_tenants(tenant_repo):
         await tenant_repo.create(tenant)
     
     # List all tenants
-    tenants, result = await tenant_repo.list(ListOptions(page_size=10, page_token=""))
+    tenants, result = await tenant_repo.list(ListOptions(page_size=10, page_token="", include_total=True))
     
     assert len(tenants) == 5
     assert result.total_count == 5
+    assert result.next_page_token == ""
+
+
+@pytest.mark.asyncio
+async def test_list_tenants_skips_total_by_default(tenant_repo):
+    """Test that the total count is only computed when requested."""
+    for i in range(3):
+        tenant = Tenant(slug=f"tenant-{i}", name=f"Tenant {i}")
+        await tenant_repo.create(tenant)
+    
+    tenants, result = await tenant_repo.list(ListOptions(page_size=10, page_token=""))
+    
+    assert len(tenants) == 3
+    assert result.total_count is None
 
 
 @pytest.mark.asyncio
@@ -119,25 +147,48 @@ async def test_list_tenants_pagination(tenant_repo):
         await tenant_repo.create(tenant)
     
     # First page
-    tenants1, result1 = await tenant_repo.list(ListOptions(page_size=5, page_token=""))
+    tenants1, result1 = await tenant_repo.list(ListOptions(page_size=5, page_token="", include_total=True))
     
     assert len(tenants1) == 5
     assert result1.total_count == 15
-    assert result1.next_page_token == "5"
+    assert result1.next_page_token != ""
     
     # Second page
-    tenants2, result2 = await tenant_repo.list(ListOptions(page_size=5, page_token="5"))
+    tenants2, result2 = await tenant_repo.list(ListOptions(page_size=5, page_token=result1.next_page_token))
     
     assert len(tenants2) == 5
-    assert tenants1[0].id != tenants2[0].id  # Different tenants
+    assert result2.next_page_token != ""
+    
+    # Last page
+    tenants3, result3 = await tenant_repo.list(ListOptions(page_size=5, page_token=result2.next_page_token))
+    
+    assert len(tenants3) == 5
+    assert result3.next_page_token == ""
+    
+    # Pages don't overlap
+    ids = {t.id for t in tenants1 + tenants2 + tenants3}
+    assert len(ids) == 15
 
 
 @pytest.mark.asyncio
 async def test_list_tenants_empty(tenant_repo):
     """Test listing tenants when none exist."""
-    tenants, result = await tenant_repo.list(ListOptions(page_size=10, page_token=""))
+    tenants, result = await tenant_repo.list(ListOptions(page_size=10, page_token="", include_total=True))
     
     assert len(tenants) == 0
     assert result.total_count == 0
     assert result.next_page_token == ""
 
+
+@pytest.mark.asyncio
+async def test_iter_all_tenants(tenant_repo):
+    """Test streaming every tenant across several cursor batches."""
+    created_ids = set()
+    for i in range(5):
+        created = await tenant_repo.create(Tenant(slug=f"tenant-{i}", name=f"Tenant {i}"))
+        created_ids.add(created.id)
+    
+    streamed = [tenant async for tenant in tenant_repo.iter_all(batch_size=2)]
+    
+    assert {t.id for t in streamed} == created_ids
+    assert len(streamed) == 5
@@ -80,12 +80,23 @@ async def test_list_users(user_repo):
         user = User(email=f"user{i}@example.com", display_name=f"User {i}")
         await user_repo.create(user)
     
-    users, result = await user_repo.list(ListOptions(page_size=10, page_token=""))
+    users, result = await user_repo.list(ListOptions(page_size=10, page_token="", include_total=True))
     
     assert len(users) == 5
     assert result.total_count == 5
 
 
+@pytest.mark.asyncio
+async def test_iter_all_users(user_repo):
+    """Test streaming every user across several cursor batches."""
+    for i in range(5):
+        await user_repo.create(User(email=f"user{i}@example.com", display_name=f"User {i}"))
+    
+    streamed = [user async for user in user_repo.iter_all(batch_size=2)]
+    
+    assert sorted(u.email for u in streamed) == [f"user{i}@example.com" for i in range(5)]
+
+
 @pytest.mark.asyncio
 async def test_add_user_to_tenant(user_repo, tenant_repo):
     """Test adding a user to a tenant."""
@@ -125,6 +136,32 @@ async def test_add_user_to_tenant_default_role(user_repo, tenant_repo):
     assert result.role == "member"
 
 
+@pytest.mark.asyncio
+async def test_add_many_users_to_tenant(user_repo, tenant_repo):
+    """Test adding several users to a tenant in one call."""
+    from app.repository.models import Tenant
+    
+    tenant = Tenant(slug="test-tenant", name="Test Tenant")
+    tenant = await tenant_repo.create(tenant)
+    
+    users = []
+    for i in range(3):
+        user = User(email=f"user{i}@example.com", display_name=f"User {i}")
+        users.append(await user_repo.create(user))
+    
+    added = await user_repo.add_many_to_tenant([
+        TenantUser(tenant_id=tenant.id, user_id=users[0].id, role="admin"),
+        TenantUser(tenant_id=tenant.id, user_id=users[1].id),
+        TenantUser(tenant_id=tenant.id, user_id=users[2].id),
+        # Duplicate membership: the last entry wins
+        TenantUser(tenant_id=tenant.id, user_id=users[1].id, role="viewer"),
+    ])
+    
+    roles = {tu.user_id: tu.role for tu in added}
+    assert roles == {users[0].id: "admin", users[1].id: "viewer", users[2].id: "member"}
+    assert await user_repo.add_many_to_tenant([]) == []
+
+
 @pytest.mark.asyncio
 async def test_remove_user_from_tenant(user_repo, tenant_repo):
     """Test removing a user from a tenant."""
@@ -162,7 +199,7 @@ async def test_list_tenant_users(user_repo, tenant_repo):
         await user_repo.add_to_tenant(tenant_user)
     
     tenant_users, result = await user_repo.list_tenant_users(
-        tenant.id, ListOptions(page_size=10, page_token="")
+        tenant.id, ListOptions(page_size=10, page_token="", include_total=True)
     )
     
     assert len(tenant_users) == 3
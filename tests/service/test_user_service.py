@@ -126,7 +126,9 @@ async def test_list_tenant_users(user_service, tenant_service):
         user = await user_service.create(f"user{i}@example.com", f"User {i}")
         await user_service.add_to_tenant(tenant.id, user.id, "member")
     
-    tenant_users, result = await user_service.list_tenant_users(tenant.id, page_size=10, page_token="")
+    tenant_users, result = await user_service.list_tenant_users(
+        tenant.id, page_size=10, page_token="", include_total=True
+    )
     
     assert len(tenant_users) == 3
     assert result.total_count == 3